@@ -0,0 +1,30 @@
+"""
+    Generation time of RandomizedDepthFirst and RandomizedBreadthFirst for growing mazes.
+    With O(1) frontier operations the time per cell stays flat as the maze grows.
+
+    Run from the repository root:
+        PYTHONPATH=src python benchmarks/mazegenerator/bench_frontier.py
+"""
+import time
+
+from mazegenerator.generator.randomizedbreadthfirst import RandomizedBreadthFirst
+from mazegenerator.generator.randomizeddepthfirst import RandomizedDepthFirst
+from mazegenerator.maze import Maze
+
+SIZES = [(100, 100), (316, 316), (1000, 1000)]
+
+
+def main():
+    print(f"{'algorithm':>24} {'size':>12} {'cells':>9} {'time (s)':>10} {'us/cell':>8}")
+    for generator in (RandomizedDepthFirst, RandomizedBreadthFirst):
+        for columns, rows in SIZES:
+            maze = Maze(columns, rows)
+            start = time.perf_counter()
+            generator(maze, rng=0).run()
+            elapsed = time.perf_counter() - start
+            print(f'{generator.__name__:>24} {f"{columns}x{rows}":>12} {len(maze):9}'
+                  f' {elapsed:10.3f} {elapsed / len(maze) * 1e6:8.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+    Generation time of RandomizedKruskal, with the disjoint-set merging (after)
+    and with the previous merging by full scan of the maze cells (before).
+
+    Run from the repository root:
+        PYTHONPATH=src python benchmarks/mazegenerator/bench_kruskal.py [--legacy-max-cells N]
+
+    The full scan is quadratic in the number of cells,
+    so it is measured only up to --legacy-max-cells.
+"""
+import argparse
+from array import array
+import time
+
+from mazegenerator.generator.randomizedkruskal import RandomizedKruskal
+from mazegenerator.maze import Maze
+
+SIZES = [(100, 100), (500, 500), (1000, 1000)]
+
+
+class LegacyKruskal(RandomizedKruskal):
+    """ RandomizedKruskal merging the sets by scanning every cell of the maze """
+
+    def run(self, sleep=0) -> bool:
+        walls = self._get_randomized_set_of_walls()
+        csets = array('l', range(len(self._maze)))
+
+        while walls:
+            coord1, direction = walls.pop()
+            coord2 = self._maze.neighbor(coord1, direction)
+
+            cset1 = csets[self._maze.index(coord1)]
+            cset2 = csets[self._maze.index(coord2)]
+
+            if cset1 != cset2:
+                self._maze.crave_passage(coord1, coord2)
+
+                for i, cset in enumerate(csets):
+                    if cset == cset2:
+                        csets[i] = cset1
+
+        return True
+
+
+def _measure(cls, columns, rows):
+    maze = Maze(columns, rows)
+    start = time.perf_counter()
+    cls(maze, rng=0).run()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--legacy-max-cells', type=int, default=10000,
+                        help='largest maze measured with the full scan merging')
+    args = parser.parse_args()
+
+    print(f"{'size':>12} {'before (s)':>12} {'after (s)':>12}")
+    for columns, rows in SIZES:
+        if columns * rows <= args.legacy_max_cells:
+            before = f'{_measure(LegacyKruskal, columns, rows):12.3f}'
+        else:
+            before = f"{'skipped':>12}"
+        after = _measure(RandomizedKruskal, columns, rows)
+        print(f'{f"{columns}x{rows}":>12} {before} {after:12.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+"""
+    Nodes expanded and time of the solvers of mazegenerator.solvers,
+    between the two ends of the longest path and between two opposite corners.
+
+    Run from the repository root:
+        PYTHONPATH=src python benchmarks/mazegenerator/bench_solvers.py [--size 500x500]
+"""
+import argparse
+
+from mazegenerator.cli import GENERATORS, generate_maze
+from mazegenerator.diameter import maze_diameter
+from mazegenerator.solvers.astar import AStar
+from mazegenerator.solvers.bidirectionalbfs import BidirectionalBfs
+from mazegenerator.solvers.deadendfilling import DeadEndFilling
+
+SOLVERS = [AStar, BidirectionalBfs, DeadEndFilling]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size', default='300x300', help='maze size as COLUMNSxROWS')
+    args = parser.parse_args()
+    columns, rows = (int(x) for x in args.size.split('x'))
+
+    print(f"{'algorithm':>14} {'query':>9} {'solver':>18} {'path':>8} {'expanded':>9} {'time (s)':>9}")
+    for algorithm in GENERATORS:
+        maze = generate_maze(algorithm, columns, rows, seed=0)
+        path, _length = maze_diameter(maze)
+        queries = {'diameter': (path[0], path[-1]), 'corners': ((0, 0), (columns - 1, rows - 1))}
+        for query, (start, goal) in queries.items():
+            for solver in SOLVERS:
+                result = solver(maze).solve(start, goal)
+                print(f'{algorithm:>14} {query:>9} {solver.__name__:>18} {len(result.path):8}'
+                      f' {result.expanded:9} {result.elapsed:9.3f}')
+
+
+if __name__ == '__main__':
+    main()
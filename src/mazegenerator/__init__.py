@@ -1,6 +1,4 @@
-from enum import Enum, IntFlag, auto
-
-from PySide6.QtGui import QColor
+from enum import Enum, IntFlag
 
 CELL_SIZE = 16
 
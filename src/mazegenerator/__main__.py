@@ -0,0 +1,9 @@
+import sys
+
+# Without arguments launch the GUI, otherwise the command line interface (it doesn't need Qt)
+if len(sys.argv) > 1:
+    from mazegenerator.cli import main
+else:
+    from mazegenerator.main import main
+
+main()
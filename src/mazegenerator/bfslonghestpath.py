@@ -1,91 +1,95 @@
 import sys
 import time
 
-from PySide6.QtCore import QObject, Signal
-
+from mazegenerator.generator.abstractgenerator import GeneratorObserver
 from mazegenerator.maze import Maze
 
 
-class BfsLonghestPath(QObject):
-
-    # Signals
-    visiting = Signal(tuple)
-    finished = Signal()
+class BfsLonghestPath:
+    """
+        Breadth-first visit of the maze on cell indexes (columns * row + column),
+        the distances from the start are kept in a flat array.
+        The visit follows the passages, the border walls of the maze are expected to be up.
+    """
 
     def __init__(self, maze: Maze):
-        super().__init__()
-
         self._maze = maze
         self.sleep = 0
+        self.distance = maze.new_buffer(value=-1)
 
-    def run(self, sleep=0, start=None, absolute_longhest=True):
+    def run(self, sleep=0, start=None, absolute_longhest=True, observer: GeneratorObserver = None):
         """
             If absolute_longhest is True the algorithm finds the longest path in the maze,
             in that case the start cell is irrelevant.
             This is achieved applying the algorithm two times.
+            For perfect mazes mazegenerator.diameter.maze_diameter is faster.
+
+            With an observer every visited cell is reported and the visit sleeps sleep seconds per cell.
         """
 
         self.sleep = sleep
 
-        # Initialize local attributes of the Maze
-        for cell in self._maze:
-            cell.distance = -1
-            cell.set_visited(False)
-            cell.prec = None
+        maze = self._maze
+        walls = maze.walls
+        passages = maze.passage_offsets()
 
-        # Init
         if not start:
-            start = self._maze.center()
-        to_visit = []
-        max_distance = 0
-        max_distance_coord = ()
-        to_visit.append(start)
-        self._maze[start].distance = 0
-
-        # BFS visit
-        while len(to_visit) > 0:
-            time.sleep(self.sleep)
-            coord = to_visit.pop(0)
-            if not self._maze[coord].is_visited():
-                self._maze[coord].set_visited()
-                if self.sleep > 0:
-                    self.visiting.emit(coord)
-                for neighbor_coord in self._maze.visitable_neighbors(coord, False):
-                    distance = self._maze[coord].distance + 1
-                    self._maze[neighbor_coord].distance = distance
-                    self._maze[neighbor_coord].prec = coord
-
-                    if distance > max_distance:
-                        max_distance = distance
-                        max_distance_coord = neighbor_coord
-                    to_visit.append(neighbor_coord)
-
+            start = maze.center()
+        farthest = self._visit(maze.index(start), passages, observer)
         if absolute_longhest:
-            return self.run(sleep, max_distance_coord, False)
-        else:
-            # Calculate longest path
-            path = []
-            path.append(max_distance_coord)
-            node = max_distance_coord
-            while self._maze[node].prec is not None:
-                node = self._maze[node].prec
-                path.append(node)
-
-            if self.sleep > 0:
-                self.finished.emit(path)
-
-            return path
+            farthest = self._visit(farthest, passages, observer)
+
+        # Calculate longest path, walking back through the cells one step nearer to the start
+        distance = self.distance
+        path = []
+        path.append(maze.coord(farthest))
+        i = farthest
+        while distance[i] > 0:
+            for offset in passages[walls[i]]:
+                if distance[i + offset] == distance[i] - 1:
+                    i += offset
+                    break
+            path.append(maze.coord(i))
+
+        return path
+
+    def _visit(self, start: int, passages, observer) -> int:
+        """ BFS visit, one level at a time: the cells of the last level are the farthest ones """
+        walls = self._maze.walls
+        distance = self.distance = self._maze.new_buffer(value=-1)
+
+        distance[start] = 0
+        to_visit = [start]
+        level = 0
+        while to_visit:
+            farthest = to_visit[0]
+            level += 1
+            next_to_visit = []
+            append = next_to_visit.append
+            if observer:
+                for i in to_visit:
+                    observer.visiting(self._maze.coord(i))
+                    time.sleep(self.sleep)
+            for i in to_visit:
+                for offset in passages[walls[i]]:
+                    j = i + offset
+                    if distance[j] < 0:
+                        distance[j] = level
+                        append(j)
+            to_visit = next_to_visit
+
+        return farthest
 
 
 if __name__ == '__main__':
 
-    def display(coord, maze):
+    def display(coord, maze, bfs):
         print()
         if coord:
             print(f"Visiting {coord}")
         for row in range(0, maze.rows):
             for column in range(0, maze.columns):
-                distance = maze[column, row].distance
+                distance = bfs.distance[maze.index((column, row))]
                 if distance >= 0:
                     sys.stdout.write(f'{distance: >6}')
                 else:
@@ -105,9 +109,9 @@ if __name__ == '__main__':
         # sys.exit(0)
 
         bfs = BfsLonghestPath(maze)
-        bfs.visiting.connect(lambda coord: display(coord, maze))
+        observer = GeneratorObserver(visiting=lambda coord: display(coord, maze, bfs))
 
-        path = bfs.run()
+        path = bfs.run(observer=observer)
 
         def fn_w(coord):
             if coord == path[0]:
@@ -119,7 +123,7 @@ if __name__ == '__main__':
             return ' '
 
         maze.print(fn_w=fn_w)
-        display(None, maze)
+        display(None, maze, bfs)
         print()
         print(path)
 
@@ -0,0 +1,250 @@
+"""
+    Command line batch generation of mazes.
+
+        python -m mazegenerator generate --algorithm kruskal --size 200x200 --count 10000 --seed 42 --jobs 8
+
+    Mazes are written one per line in the Maze[...] repr format,
+    or one after the other in the binary format of mazegenerator.mazefile (--format binary).
+
+        python -m mazegenerator stream --columns 1000 [--rows 1000000] --seed 42 --output maze.map
+
+    Generates a single maze with Eller's algorithm, writing it row by row (unpacked binary format),
+    without ever holding the whole maze in memory. Without --rows the maze is endless.
+
+        python -m mazegenerator diameter mazes.bin --jobs 8
+
+    Prints the diameter (longest path length) of each maze of a file written by generate, in either format,
+    and a summary of the corpus on stderr.
+
+        python -m mazegenerator export mazes.bin maze.png [--index 0] [--scale 4] [--path]
+
+    Draws a maze of a file written by generate as a PNG or PBM image (see mazegenerator.raster),
+    optionally with its longest path.
+"""
+import argparse
+from multiprocessing import Pool
+import os
+import sys
+import time
+
+from mazegenerator.generator.eller import Eller
+from mazegenerator.generator.randomizedbreadthfirst import RandomizedBreadthFirst
+from mazegenerator.generator.randomizeddepthfirst import RandomizedDepthFirst
+from mazegenerator.generator.randomizedkruskal import RandomizedKruskal
+from mazegenerator import mazefile, raster
+from mazegenerator.diameter import batch_diameters, maze_diameter
+from mazegenerator.maze import Maze
+
+GENERATORS = {
+    'depthfirst': RandomizedDepthFirst,
+    'breadthfirst': RandomizedBreadthFirst,
+    'kruskal': RandomizedKruskal,
+    'eller': Eller,
+}
+
+
+def generate_maze(algorithm: str, columns: int, rows: int, seed=None) -> Maze:
+    """ With a seed the maze is fully determined by the arguments """
+    maze = Maze(columns, rows)
+    GENERATORS[algorithm](maze, rng=seed).run()
+    return maze
+
+
+def _generate_task(task) -> bytes:
+    algorithm, columns, rows, seed, output_format = task
+    maze = generate_maze(algorithm, columns, rows, seed)
+    if output_format == 'binary':
+        return maze.to_bytes()
+    return repr(maze).encode() + b'\n'
+
+
+def _parse_size(value: str) -> (int, int):
+    try:
+        columns, rows = (int(x) for x in value.lower().split('x'))
+    except ValueError as ex:
+        raise argparse.ArgumentTypeError(f"invalid size '{value}', expected COLUMNSxROWS") from ex
+    if columns < 1 or rows < 1:
+        raise argparse.ArgumentTypeError(f"invalid size '{value}', expected positive dimensions")
+    return columns, rows
+
+
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError as ex:
+        raise argparse.ArgumentTypeError(f"invalid number '{value}'") from ex
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"invalid number '{value}', expected a positive integer")
+    return number
+
+
+def _non_negative_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError as ex:
+        raise argparse.ArgumentTypeError(f"invalid number '{value}'") from ex
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"invalid number '{value}', expected zero or a positive integer")
+    return number
+
+
+def _parse_cmdline(argv):
+    parser = argparse.ArgumentParser(prog='python -m mazegenerator')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    parser_generate = subparsers.add_parser('generate', help='generate mazes in batch')
+    parser_generate.add_argument('--algorithm', choices=GENERATORS.keys(), default='depthfirst',
+                                 help='generation algorithm')
+    parser_generate.add_argument('--size', type=_parse_size, default=(45, 35),
+                                 help='maze size as COLUMNSxROWS (default: 45x35)')
+    parser_generate.add_argument('--count', type=_non_negative_int, default=1,
+                                 help='number of mazes to generate')
+    parser_generate.add_argument('--seed', type=int,
+                                 help='seed of the first maze, the next ones use seed + 1, seed + 2, ...')
+    parser_generate.add_argument('--jobs', type=_positive_int, default=os.cpu_count(),
+                                 help='number of worker processes (default: number of CPUs)')
+    parser_generate.add_argument('--format', choices=['repr', 'binary'], default='repr',
+                                 help='output format (default: repr)')
+    parser_generate.add_argument('--output', help='output file (default: stdout)')
+
+    parser_stream = subparsers.add_parser('stream', help="stream a maze row by row (Eller's algorithm)")
+    parser_stream.add_argument('--columns', type=_positive_int, required=True, help='number of columns')
+    parser_stream.add_argument('--rows', type=_positive_int, help='number of rows (default: endless)')
+    parser_stream.add_argument('--seed', type=int, help='seed of the maze')
+    parser_stream.add_argument('--output', help='output file (default: stdout)')
+
+    parser_diameter = subparsers.add_parser('diameter', help='diameter of each maze of a file')
+    parser_diameter.add_argument('input', help='file of mazes, in repr or binary format')
+    parser_diameter.add_argument('--jobs', type=_positive_int, default=os.cpu_count(),
+                                 help='number of worker processes (default: number of CPUs)')
+
+    parser_export = subparsers.add_parser('export', help='draw a maze of a file as a PNG or PBM image')
+    parser_export.add_argument('input', help='file of mazes, in repr or binary format')
+    parser_export.add_argument('output', help='image file')
+    parser_export.add_argument('--format', choices=['png', 'pbm'],
+                               help='image format (default: from the output file name)')
+    parser_export.add_argument('--index', type=int, default=0,
+                               help='index of the maze in the file (default: 0)')
+    parser_export.add_argument('--scale', type=_positive_int, default=1,
+                               help='pixels per pixel of the maze (default: 1)')
+    parser_export.add_argument('--path', action='store_true', help='draw the longest path (PNG only)')
+
+    return parser.parse_args(argv)
+
+
+def generate(args):
+    columns, rows = args.size
+    tasks = [(args.algorithm, columns, rows, None if args.seed is None else args.seed + i, args.format)
+             for i in range(args.count)]
+
+    if args.output:
+        output = open(args.output, 'wb')  # pylint: disable=consider-using-with
+    else:
+        output = sys.stdout.buffer
+
+    start = time.perf_counter()
+    try:
+        if args.jobs > 1:
+            chunksize = max(1, min(100, args.count // (args.jobs * 4)))
+            with Pool(args.jobs) as pool:
+                # imap keeps the order of the tasks, so the output is reproducible
+                for data in pool.imap(_generate_task, tasks, chunksize):
+                    output.write(data)
+        else:
+            for task in tasks:
+                output.write(_generate_task(task))
+    finally:
+        if args.output:
+            output.close()
+        else:
+            output.flush()
+    elapsed = time.perf_counter() - start
+
+    print(f'Generated {args.count} mazes in {elapsed:.2f}s ({args.count / elapsed:.1f} mazes/s)',
+          file=sys.stderr)
+
+
+def stream(args):
+    if args.output:
+        output = open(args.output, 'wb')  # pylint: disable=consider-using-with
+    else:
+        output = sys.stdout.buffer
+
+    start = time.perf_counter()
+    rows = 0
+    try:
+        rows = mazefile.write_rows(output, args.columns, Eller.stream(args.columns, args.rows, args.seed),
+                                   args.seed, args.rows)
+    except (BrokenPipeError, KeyboardInterrupt):
+        # Endless mazes stop when the reader goes away or on Ctrl-C
+        return
+    finally:
+        if args.output:
+            output.close()
+    elapsed = time.perf_counter() - start
+
+    print(f'Streamed {rows} rows in {elapsed:.2f}s ({rows / elapsed:.1f} rows/s)', file=sys.stderr)
+
+
+def read_mazes(path):
+    """ Yield the binary serialization of each maze of a file written by generate, in either format """
+    with open(path, 'rb') as f:
+        if f.read(len(mazefile.MAGIC)) == mazefile.MAGIC:
+            f.seek(0)
+            while True:
+                try:
+                    yield Maze.load(f).to_bytes()
+                except EOFError:
+                    return
+        else:
+            f.seek(0)
+            for line in f:
+                if line.strip():
+                    yield Maze.from_str(line.strip().decode()).to_bytes()
+
+
+def diameter(args):
+    start = time.perf_counter()
+    lengths = []
+    for length in batch_diameters(read_mazes(args.input), args.jobs):
+        print(length)
+        lengths.append(length)
+    elapsed = time.perf_counter() - start
+
+    if lengths:
+        print(f'{len(lengths)} mazes in {elapsed:.2f}s, diameter min {min(lengths)}'
+              f' mean {sum(lengths) / len(lengths):.1f} max {max(lengths)}', file=sys.stderr)
+
+
+def export(args):
+    for i, data in enumerate(read_mazes(args.input)):
+        if i == args.index:
+            break
+    else:
+        raise SystemExit(f'No maze {args.index} in {args.input}')
+    maze = Maze.from_bytes(data)
+
+    start = time.perf_counter()
+    path = maze_diameter(maze)[0] if args.path else None
+    raster.export(maze, args.output, args.format, path, args.scale)
+    elapsed = time.perf_counter() - start
+
+    width, height = raster.image_size(maze, args.scale)
+    print(f'Exported a {width}x{height} image in {elapsed:.2f}s', file=sys.stderr)
+
+
+def main(argv=None):
+    args = _parse_cmdline(argv)
+
+    if args.command == 'generate':
+        generate(args)
+    elif args.command == 'stream':
+        stream(args)
+    elif args.command == 'diameter':
+        diameter(args)
+    elif args.command == 'export':
+        export(args)
+
+
+if __name__ == '__main__':
+    main()
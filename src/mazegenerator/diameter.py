@@ -0,0 +1,92 @@
+"""
+    Diameter (longest path) of perfect mazes.
+
+    Every generator produces a perfect maze, that is a spanning tree of the cells:
+    the farthest cell from any cell is an end of a longest path, and a tree visit
+    needs no distance or visited flags, just the parent of each cell.
+"""
+from array import array
+from multiprocessing import Pool
+
+from mazegenerator.maze import Maze
+
+
+class MazeDiameter:
+    """
+        Computes the diameter of perfect mazes, reusing the same buffer from a maze to the next.
+    """
+
+    def __init__(self):
+        self._parent = array('i')
+
+    def run(self, maze: Maze) -> (list, int):
+        """ Return (path, length): the cells of a longest path and its length in steps """
+        if len(self._parent) < len(maze):
+            self._parent = maze.new_buffer()
+
+        passages = maze.passage_offsets()
+        end1, _length = self._farthest(maze, 0, passages)
+        end2, length = self._farthest(maze, end1, passages)
+
+        # The parents lead from end2 back to end1
+        parent = self._parent
+        path = [maze.coord(end2)]
+        i = end2
+        while parent[i] >= 0:
+            i = parent[i]
+            path.append(maze.coord(i))
+
+        return path, length
+
+    def _farthest(self, maze: Maze, start: int, passages) -> (int, int):
+        """ Visit the tree from start one level at a time, return the farthest cell and its distance """
+        parent = self._parent
+        walls = maze.walls
+
+        parent[start] = -1
+        to_visit = [start]
+        visited = 1
+        level = 0
+        while True:
+            next_to_visit = []
+            append = next_to_visit.append
+            for i in to_visit:
+                p = parent[i]
+                for offset in passages[walls[i]]:
+                    j = i + offset
+                    if j != p:
+                        parent[j] = i
+                        append(j)
+
+            if not next_to_visit:
+                return to_visit[0], level
+
+            # In a maze with loops the visit would never end
+            visited += len(next_to_visit)
+            if visited > len(maze):
+                raise ValueError('Not a perfect maze')
+
+            to_visit = next_to_visit
+            level += 1
+
+
+def maze_diameter(maze: Maze) -> (list, int):
+    return MazeDiameter().run(maze)
+
+
+_WORKER_DIAMETER = MazeDiameter()
+
+
+def _diameter_length(data: bytes) -> int:
+    # Every worker process reuses its own buffer
+    return _WORKER_DIAMETER.run(Maze.from_bytes(data))[1]
+
+
+def batch_diameters(mazes, jobs=None, chunksize=16):
+    """
+        Yield the diameter length of each maze, in order, computed in a pool of jobs processes.
+        mazes is an iterable of Maze or of their binary serialization (Maze.to_bytes).
+    """
+    data = (maze.to_bytes() if isinstance(maze, Maze) else maze for maze in mazes)
+    with Pool(jobs) as pool:
+        yield from pool.imap(_diameter_length, data, chunksize)
@@ -0,0 +1,46 @@
+from array import array
+
+from mazegenerator.maze import index_typecode
+
+
+class DisjointSet:
+    """
+        Union-find structure over the integers 0 .. size - 1,
+        stored in flat arrays, with path compression and union by rank.
+    """
+
+    def __init__(self, size: int):
+        self._parent = array(index_typecode(size), range(size))
+        self._rank = bytearray(size)
+
+    def __len__(self):
+        return len(self._parent)
+
+    def find(self, i: int) -> int:
+        parent = self._parent
+
+        root = i
+        while parent[root] != root:
+            root = parent[root]
+
+        # Path compression
+        while parent[i] != root:
+            parent[i], i = root, parent[i]
+
+        return root
+
+    def union(self, i: int, j: int) -> bool:
+        """ Merge the sets containing i and j, return False if they were already the same set """
+        root_i = self.find(i)
+        root_j = self.find(j)
+        if root_i == root_j:
+            return False
+
+        rank = self._rank
+        if rank[root_i] < rank[root_j]:
+            root_i, root_j = root_j, root_i
+        self._parent[root_j] = root_i
+        if rank[root_i] == rank[root_j]:
+            rank[root_i] += 1
+
+        return True
@@ -0,0 +1,150 @@
+"""
+    Distance oracle for perfect mazes.
+
+    A perfect maze is a spanning tree of the cells, so the distance between two cells is
+    depth(a) + depth(b) - 2 * depth(lca(a, b)) once the tree is rooted.
+    The lowest common ancestor is found on the Euler tour of the tree: it's the shallowest cell
+    visited between the first visits of a and b. That range minimum uses a sparse table over
+    blocks of the tour, plus the prefix and suffix minimums inside each block,
+    so the index takes linear memory and answers in O(1) (a short scan when both ends are in the same block).
+"""
+from array import array
+
+from mazegenerator.maze import Maze, index_typecode
+
+
+class MazeDistanceIndex:
+
+    def __init__(self, maze: Maze, root=(0, 0)):
+        self._maze = maze
+        cells = len(maze)
+
+        self._parent = maze.new_buffer(value=-1)
+        self._depth = maze.new_buffer()
+        self._first = maze.new_buffer()
+        self._euler = array(index_typecode(cells))
+        self._euler_depth = array(index_typecode(cells))
+        self._build_euler_tour(maze.index(root))
+        if len(self._euler) != 2 * cells - 1:
+            raise ValueError('Not a perfect maze')
+
+        self._block = max(4, len(self._euler).bit_length())
+        self._build_blocks()
+
+    def _build_euler_tour(self, root: int):
+        walls = self._maze.walls
+        passages = self._maze.passage_offsets()
+        parent = self._parent
+        depth = self._depth
+        first = self._first
+        euler = self._euler
+        euler_depth = self._euler_depth
+        seen = bytearray(len(self._maze))
+
+        seen[root] = 1
+        euler.append(root)
+        euler_depth.append(0)
+        stack = [(root, iter(passages[walls[root]]))]
+        while stack:
+            node, children = stack[-1]
+            for offset in children:
+                child = node + offset
+                if child != parent[node]:
+                    if seen[child]:
+                        raise ValueError('Not a perfect maze')
+                    seen[child] = 1
+                    parent[child] = node
+                    depth[child] = depth[node] + 1
+                    first[child] = len(euler)
+                    euler.append(child)
+                    euler_depth.append(depth[child])
+                    stack.append((child, iter(passages[walls[child]])))
+                    break
+            else:
+                stack.pop()
+                if stack:
+                    euler.append(stack[-1][0])
+                    euler_depth.append(depth[stack[-1][0]])
+
+    def _build_blocks(self):
+        euler_depth = self._euler_depth
+        size = len(euler_depth)
+        block = self._block
+
+        # Position of the minimum depth from the start of its block to p, and from p to the end of its block
+        self._prefix_min = array(index_typecode(size), range(size))
+        self._suffix_min = array(index_typecode(size), range(size))
+        prefix_min = self._prefix_min
+        suffix_min = self._suffix_min
+        for p in range(size):
+            if p % block and euler_depth[prefix_min[p - 1]] < euler_depth[p]:
+                prefix_min[p] = prefix_min[p - 1]
+        for p in range(size - 2, -1, -1):
+            if (p + 1) % block and euler_depth[suffix_min[p + 1]] < euler_depth[p]:
+                suffix_min[p] = suffix_min[p + 1]
+
+        # Sparse table over the block minimums: level k holds the minimum of 2 ** k blocks
+        level = [suffix_min[start] for start in range(0, size, block)]
+        self._table = [level]
+        blocks = len(level)
+        half = 1
+        while 2 * half <= blocks:
+            level = [p1 if euler_depth[p1] <= euler_depth[p2] else p2
+                     for p1, p2 in zip(level, level[half:])]
+            self._table.append(level)
+            half *= 2
+
+    def _min_position(self, left: int, right: int) -> int:
+        """ Position of the minimum depth of the Euler tour in [left, right] """
+        euler_depth = self._euler_depth
+        block_left = left // self._block
+        block_right = right // self._block
+        if block_left == block_right:
+            depths = euler_depth[left:right + 1]
+            return left + depths.index(min(depths))
+
+        best = self._suffix_min[left]
+        position = self._prefix_min[right]
+        if euler_depth[position] < euler_depth[best]:
+            best = position
+        if block_right - block_left > 1:
+            k = (block_right - block_left - 1).bit_length() - 1
+            level = self._table[k]
+            for position in (level[block_left + 1], level[block_right - (1 << k)]):
+                if euler_depth[position] < euler_depth[best]:
+                    best = position
+        return best
+
+    def _lca(self, i: int, j: int) -> int:
+        left = self._first[i]
+        right = self._first[j]
+        if left > right:
+            left, right = right, left
+        return self._euler[self._min_position(left, right)]
+
+    def lca(self, a: (int, int), b: (int, int)) -> (int, int):
+        """ The lowest common ancestor of a and b in the tree rooted at root """
+        return self._maze.coord(self._lca(self._maze.index(a), self._maze.index(b)))
+
+    def distance(self, a: (int, int), b: (int, int)) -> int:
+        i = self._maze.index(a)
+        j = self._maze.index(b)
+        return self._depth[i] + self._depth[j] - 2 * self._depth[self._lca(i, j)]
+
+    def path(self, a: (int, int), b: (int, int)) -> list:
+        """ The cells from a to b """
+        i = self._maze.index(a)
+        j = self._maze.index(b)
+        ancestor = self._lca(i, j)
+
+        head = [i]
+        while i != ancestor:
+            i = self._parent[i]
+            head.append(i)
+        tail = []
+        while j != ancestor:
+            tail.append(j)
+            j = self._parent[j]
+        tail.reverse()
+
+        return [self._maze.coord(k) for k in head + tail]
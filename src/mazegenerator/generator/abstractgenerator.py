@@ -1,41 +1,128 @@
-from random import randint
+from random import Random
 import time
 
-from PySide6.QtCore import QObject, Signal
-
 from mazegenerator.maze import Maze
 
 
-class AbstractGenerator(QObject):
+class GeneratorObserver:
+    """
+        Receives the progress of a running generator.
+        Callbacks not passed to the constructor do nothing,
+        subclasses can override the methods instead.
+    """
+
+    def __init__(self, tovisit=None, visiting=None, visited=None):
+        self._tovisit = tovisit
+        self._visiting = visiting
+        self._visited = visited
+
+    def tovisit(self, coord):
+        if self._tovisit:
+            self._tovisit(coord)
+
+    def visiting(self, coord):
+        if self._visiting:
+            self._visiting(coord)
+
+    def visited(self, coord):
+        if self._visited:
+            self._visited(coord)
+
+    def paused(self):
+        """ The generator is paused, nothing is reported until it resumes """
 
-    # Signals
-    tovisit = Signal(tuple)
-    visiting = Signal(tuple)
-    visited = Signal(tuple)
+    def flush(self):
+        """ Called before the generator sleeps: what was reported so far should be shown now """
 
-    def __init__(self, maze: Maze, start_column=-1, start_row=-1, start_at_random=False):
+
+TOVISIT = 1
+VISITING = 2
+VISITED = 4
+
+
+class BatchObserver(GeneratorObserver):
+    """
+        Accumulates the progress of a generator and hands it over in batches,
+        at most once every interval seconds (60 per second by default).
+        flush receives a list of (status, coord) in the order they happened,
+        status is one of TOVISIT, VISITING, VISITED.
+
+        Pending updates are also delivered before the generator sleeps between steps
+        and when it pauses, call flush() when the generator ends to deliver the last ones.
+    """
+
+    def __init__(self, flush, interval=1 / 60):
         super().__init__()
+        self._flush = flush
+        self._interval = interval
+        self._updates = []
+        self._last_flush = time.monotonic()
+
+    def tovisit(self, coord):
+        self._add(TOVISIT, coord)
 
+    def visiting(self, coord):
+        self._add(VISITING, coord)
+
+    def visited(self, coord):
+        self._add(VISITED, coord)
+
+    def _add(self, status, coord):
+        self._updates.append((status, coord))
+        if time.monotonic() - self._last_flush >= self._interval:
+            self.flush()
+
+    def paused(self):
+        self.flush()
+
+    def flush(self):
+        self._last_flush = time.monotonic()
+        if self._updates:
+            updates = self._updates
+            self._updates = []
+            self._flush(updates)
+
+
+class AbstractGenerator:
+    """
+        Base class of the maze generators, it does not depend on Qt.
+
+        run(sleep, observer) reports every step to the observer and sleeps sleep seconds per step.
+        Without an observer the generator runs in batch mode: nothing is reported and it never sleeps.
+
+        rng is the source of randomness of the generator: a random.Random instance or an integer seed.
+        With a seed the maze is reproducible from (algorithm, columns, rows, seed) alone,
+        the seed is recorded in maze.seed.
+    """
+
+    def __init__(self, maze: Maze, start_column=-1, start_row=-1, start_at_random=False, rng=None):
         self._maze = maze
 
+        if isinstance(rng, Random):
+            self._rng = rng
+        else:
+            self._rng = Random(rng)
+            maze.seed = rng
+
         if start_column < 0 or start_column >= maze.columns:
             if start_at_random:
-                start_column = randint(0, maze.columns - 1)
+                start_column = self._rng.randint(0, maze.columns - 1)
             else:
                 start_column = int(maze.columns / 2)
         if start_row < 0 or start_row >= maze.rows:
             if start_at_random:
-                start_row = randint(0, maze.rows - 1)
+                start_row = self._rng.randint(0, maze.rows - 1)
             else:
                 start_row = int(maze.rows / 2)
 
         self._maze.start_column = start_column
         self._maze.start_row = start_row
         self.sleep = 0
+        self._observer = None
         self._running = False
         self._paused = False
 
-    def run(self, sleep=0) -> bool:
+    def run(self, sleep=0, observer: GeneratorObserver = None) -> bool:
         raise NotImplementedError('To be implemented.')
 
     def stop(self):
@@ -45,6 +132,14 @@ class AbstractGenerator(QObject):
     def pause(self, flag):
         self._paused = flag
 
+    def _sleep(self):
+        """ The pause between two steps, the observer shows the step before it """
+        if self.sleep > 0:
+            self._observer.flush()
+            time.sleep(self.sleep)
+
     def _wait_for_unpause(self):
+        if self._observer:
+            self._observer.paused()
         while self._paused:
             time.sleep(.01)
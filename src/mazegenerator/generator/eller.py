@@ -1,8 +1,6 @@
-import random
-import time
 from typing import override
 
-from mazegenerator.generator.abstractgenerator import AbstractGenerator
+from mazegenerator.generator.abstractgenerator import AbstractGenerator, GeneratorObserver
 from mazegenerator.maze import Maze
 
 
@@ -25,13 +23,17 @@ class Eller(AbstractGenerator):
             Make sure that each set has at least one cell without a bottom-wall (This prevents isolations)
          
          3. Prepare for the next row   
+
+    Only the current and the next row are needed, so stream() can generate mazes of any height
+    (even endless ones) row by row in O(columns) memory.
     """
 
     @override
-    def run(self, sleep=0):
+    def run(self, sleep=0, observer: GeneratorObserver = None):
         """Generate a maze using Eller's algorithm."""
 
         self.sleep = sleep
+        self._observer = observer
 
         row_sets = [0] * self._maze.columns
         next_row_sets = [0] * self._maze.columns
@@ -41,23 +43,66 @@ class Eller(AbstractGenerator):
         self._paused = False
 
         for r in range(self._maze.rows):
+            last = r == self._maze.rows - 1
             next_set_id = self._generate_ids(row_sets, next_set_id)
+            members = self._index_sets(row_sets)
 
             # Step 1: Merge adjacent cells in the row randomly
-            self._merge_cells_in_row(r, row_sets)
+            self._merge_cells_in_row(r, row_sets, members, last)
             if not self._running:
                 return False
             if self._paused:
                 self._wait_for_unpause()
 
             # Step 2: Create vertical connections for each set
-            self._create_vertical_connections(r, row_sets, next_row_sets)
+            self._create_vertical_connections(r, row_sets, members, next_row_sets, last)
 
             # Step 3: Prepare for the next row
             row_sets = next_row_sets[:]
             next_row_sets = [0] * self._maze.columns
 
-        return r == self._maze.rows - 1
+        # A stopped run has returned in the loop, also a maze without rows is complete
+        return True
+
+    @staticmethod
+    def stream(columns: int, rows=None, rng=None):
+        """
+            Generate a maze row by row, yielding the wall bits of each row (bytes of columns items).
+            With rows None the maze never ends.
+        """
+        # The rows are carved in a two rows window: the current row and the next one
+        window = Maze(columns, 2)
+        eller = Eller(window, rng=rng)
+        return eller._stream_rows(rows)  # pylint: disable=protected-access
+
+    def _stream_rows(self, rows):
+        columns = self._maze.columns
+        walls = self._maze.walls
+        new_row = bytes(walls[columns:])
+
+        row_sets = [0] * columns
+        next_row_sets = [0] * columns
+        next_set_id = 1
+
+        self._running = True
+        self._paused = False
+
+        r = 0
+        while rows is None or r < rows:
+            last = r == rows - 1 if rows is not None else False
+            next_set_id = self._generate_ids(row_sets, next_set_id)
+            members = self._index_sets(row_sets)
+            self._merge_cells_in_row(0, row_sets, members, last)
+            self._create_vertical_connections(0, row_sets, members, next_row_sets, last)
+
+            yield bytes(walls[:columns])
+
+            # Slide the window down
+            walls[:columns] = walls[columns:]
+            walls[columns:] = new_row
+            row_sets = next_row_sets
+            next_row_sets = [0] * columns
+            r += 1
 
     def _generate_ids(self, row_sets, next_set_id):
         """Assign IDs to the current row cells if they don't have one"""
@@ -67,53 +112,62 @@ class Eller(AbstractGenerator):
                 next_set_id += 1
         return next_set_id
 
-    def _merge_cells_in_row(self, r, row_sets):
+    @staticmethod
+    def _index_sets(row_sets):
+        """ Return the columns of the row of each set: set id -> list of columns """
+        members = {}
+        for c, set_id in enumerate(row_sets):
+            if set_id in members:
+                members[set_id].append(c)
+            else:
+                members[set_id] = [c]
+        return members
+
+    def _merge_cells_in_row(self, r, row_sets, members, last):
         """ Merge adjacent cells in the row randomly """
         for c in range(self._maze.columns - 1):
             set1 = row_sets[c]
             set2 = row_sets[c + 1]
             # if set differs, merge randomly or always if we are on the last line
-            if set1 != set2 and (random.choice([True, False]) or r == self._maze.rows - 1):
+            if set1 != set2 and (self._rng.getrandbits(1) or last):
                 self._maze.crave_passage((c, r), (c + 1, r))
-                for k in range(c + 1, self._maze.columns):
-                    if row_sets[k] == set2:
-                        row_sets[k] = set1  # Merge sets
-            self.visited.emit((c, r))
-            time.sleep(self.sleep)
+                # Merge sets, relabeling the columns of the smaller one
+                if len(members[set1]) < len(members[set2]):
+                    set1, set2 = set2, set1
+                merged = members.pop(set2)
+                for k in merged:
+                    row_sets[k] = set1
+                members[set1].extend(merged)
+            if self._observer:
+                self._observer.visited((c, r))
+                self._sleep()
             if not self._running:
                 return
             if self._paused:
                 self._wait_for_unpause()
 
         # Last cell in the row could be considered visited
-        self.visited.emit((c + 1, r))
-        time.sleep(self.sleep)
+        if self._observer:
+            self._observer.visited((self._maze.columns - 1, r))
+            self._sleep()
 
-    def _create_vertical_connections(self, r, row_sets, next_row_sets):
+    def _create_vertical_connections(self, r, row_sets, members, next_row_sets, last):
         """Create vertical connections for each set"""
-        if r < self._maze.rows - 1:  # Skip vertical connections if it's the last row
-            set_all = set()
+        if not last:  # Skip vertical connections if it's the last row
             set_used = set()
             for c in range(self._maze.columns):
-                set_all.add(row_sets[c])
                 # Ramdomly crave vertical passage
-                if random.choice([True, False]):
+                if self._rng.getrandbits(1):
                     self._maze.crave_passage((c, r), (c, r + 1))
                     next_row_sets[c] = row_sets[c]
                     set_used.add(row_sets[c])
 
             # Make sure that each set has at least one cell without a bottom-wall
-            diff = set_all.difference(set_used)
-            if diff:
-                for set1 in diff:
-                    cset = []
-                    for c in range(self._maze.columns):
-                        if row_sets[c] == set1:
-                            cset.append(c)
-
-                    c = random.choice(cset)
+            for set1, columns in members.items():
+                if set1 not in set_used:
+                    c = self._rng.choice(columns)
                     self._maze.crave_passage((c, r), (c, r + 1))
-                    next_row_sets[c] = row_sets[c]
+                    next_row_sets[c] = set1
 
 
 if __name__ == '__main__':
@@ -133,10 +187,11 @@ if __name__ == '__main__':
         display_step = False
 
         alg = Eller(maze)
+        observer = None
         if display_step:
-            alg.visited.connect(lambda coord: display(maze, coord))
+            observer = GeneratorObserver(visited=lambda coord: display(maze, coord))
 
-        alg.run(0)
+        alg.run(0, observer)
 
         print(' ')
         maze.print()
@@ -1,22 +1,21 @@
-
-import random
-import time
 from typing import override
 
-from mazegenerator.generator.abstractgenerator import AbstractGenerator
+from mazegenerator.generator.abstractgenerator import AbstractGenerator, GeneratorObserver
 from mazegenerator.maze import Maze
 
 
 class RandomizedBreadthFirst(AbstractGenerator):
 
     @override
-    def run(self, sleep=0) -> bool:
+    def run(self, sleep=0, observer: GeneratorObserver = None) -> bool:
 
         self.sleep = sleep
-        to_visit = []
+        self._observer = observer
+        to_visit = []  # Random bag, insertion order doesn't matter
         coord = (self._maze.start_column, self._maze.start_row)
         to_visit.append((None, coord))
-        self.tovisit.emit(coord)
+        if observer:
+            observer.tovisit(coord)
 
         # directions = [Direction.NORTH, Direction.SOUTH, Direction.EAST, Direction.WEST]
 
@@ -26,24 +25,28 @@ class RandomizedBreadthFirst(AbstractGenerator):
             if self._paused:
                 self._wait_for_unpause()
 
-            # The core point is to choose a random element from the frontier
-            # TODO: swap before pop?
-            from_coord, coord = to_visit.pop(random.randrange(len(to_visit)))
+            # The core point is to choose a random element from the frontier,
+            # swapping it with the last one before the pop makes the removal O(1)
+            i = self._rng.randrange(len(to_visit))
+            to_visit[i], to_visit[-1] = to_visit[-1], to_visit[i]
+            from_coord, coord = to_visit.pop()
 
             if not self._maze[coord].is_visited():
-                self.visiting.emit(coord)
-
-                time.sleep(self.sleep)
+                if observer:
+                    observer.visiting(coord)
+                    self._sleep()
 
                 if from_coord:  # None just at the first step
                     self._maze.crave_passage(from_coord, coord)
 
                 for neighbor in self._maze.neighbors(coord, False):
                     to_visit.append((coord, neighbor))  # doesn't matter where I insert, I pop randomly
-                    self.tovisit.emit(neighbor)
+                    if observer:
+                        observer.tovisit(neighbor)
 
                 self._maze[coord].set_visited()
-                self.visited.emit(coord)
+                if observer:
+                    observer.visited(coord)
 
         return len(to_visit) == 0
 
@@ -63,10 +66,11 @@ if __name__ == '__main__':
         display_step = True
 
         alg = RandomizedBreadthFirst(maze)
+        observer = None
         if display_step:
-            alg.visiting.connect(lambda coord: display(maze, coord))
+            observer = GeneratorObserver(visiting=lambda coord: display(maze, coord))
 
-        alg.run(.2)
+        alg.run(.2, observer)
 
         print(' ')
         maze.print()
@@ -1,24 +1,24 @@
-import random
 import sys
-import time
 from typing import override
 
 from mazegenerator import Direction
-from mazegenerator.generator.abstractgenerator import AbstractGenerator
+from mazegenerator.generator.abstractgenerator import AbstractGenerator, GeneratorObserver
 from mazegenerator.maze import Maze
 
 
 class RandomizedDepthFirst(AbstractGenerator):
 
     @override
-    def run(self, sleep=0) -> bool:
+    def run(self, sleep=0, observer: GeneratorObserver = None) -> bool:
 
         self.sleep = sleep
+        self._observer = observer
 
-        to_visit = []
+        to_visit = []  # Stack, the top is the end of the list
         coord = (self._maze.start_column, self._maze.start_row)
         to_visit.append((None, coord))
-        self.tovisit.emit(coord)
+        if observer:
+            observer.tovisit(coord)
 
         self._running = True
         self._paused = False
@@ -26,12 +26,12 @@ class RandomizedDepthFirst(AbstractGenerator):
             if self._paused:
                 self._wait_for_unpause()
 
-            from_coord, coord = to_visit.pop(0)
+            from_coord, coord = to_visit.pop()
 
             if not self._maze[coord].is_visited():
-                self.visiting.emit(coord)
-
-                time.sleep(self.sleep)
+                if observer:
+                    observer.visiting(coord)
+                    self._sleep()
 
                 self._maze[coord].set_visited()
 
@@ -39,13 +39,15 @@ class RandomizedDepthFirst(AbstractGenerator):
                     self._maze.crave_passage(from_coord, coord)
 
                 neighbors = self._maze.neighbors(coord, False)  # choose a random direction
-                random.shuffle(neighbors)
+                self._rng.shuffle(neighbors)
                 for neighbor in neighbors:
-                    to_visit.insert(0, (coord, neighbor))  # push at the end (FIFO)
-                    self.tovisit.emit(neighbor)
+                    to_visit.append((coord, neighbor))  # push on the stack (LIFO)
+                    if observer:
+                        observer.tovisit(neighbor)
 
                 self._maze[coord].set_visited()
-                self.visited.emit(coord)
+                if observer:
+                    observer.visited(coord)
 
         return len(to_visit) == 0
 
@@ -88,11 +90,12 @@ if __name__ == '__main__':
         display_step = True
 
         alg = RandomizedDepthFirst(maze, 0, 0)
-        # alg.visiting.connect(lambda coord: print(f"Visiting: {coord}"))
+        # observer = GeneratorObserver(visiting=lambda coord: print(f"Visiting: {coord}"))
+        observer = None
         if display_step:
-            alg.visiting.connect(lambda coord: display(maze))
+            observer = GeneratorObserver(visiting=lambda coord: display(maze))
 
-        alg.run(.2)
+        alg.run(.2, observer)
 
         # for step in generate(maze, 0, 0, depthfirst=True):
         #     if display_step:
@@ -1,9 +1,8 @@
-import random
-import time
 from typing import override
 
 from mazegenerator import Direction
-from mazegenerator.generator.abstractgenerator import AbstractGenerator
+from mazegenerator.disjointset import DisjointSet
+from mazegenerator.generator.abstractgenerator import AbstractGenerator, GeneratorObserver
 from mazegenerator.maze import Maze
 
 
@@ -20,18 +19,18 @@ class RandomizedKruskal(AbstractGenerator):
                     walls.append(((column, row), Direction.NORTH))
                 if column > 0:
                     walls.append(((column, row), Direction.WEST))
-        random.shuffle(walls)
+        self._rng.shuffle(walls)
 
         return walls
 
     @override
-    def run(self, sleep=0) -> bool:
+    def run(self, sleep=0, observer: GeneratorObserver = None) -> bool:
 
         self.sleep = sleep
+        self._observer = observer
 
         walls = self._get_randomized_set_of_walls()
-        for i, cell in enumerate(self._maze):
-            cell.cset = i
+        csets = DisjointSet(len(self._maze))
 
         self._running = True
         self._paused = False
@@ -42,22 +41,16 @@ class RandomizedKruskal(AbstractGenerator):
             coord1, direction = walls.pop()
             coord2 = self._maze.neighbor(coord1, direction)
 
-            cset1 = self._maze[coord1].cset
-            cset2 = self._maze[coord2].cset
-
-            if cset1 != cset2:
-                time.sleep(self.sleep)
-
+            if csets.union(self._maze.index(coord1), self._maze.index(coord2)):
                 self._maze.crave_passage(coord1, coord2)
 
-                for cell in self._maze:
-                    if cell.cset == cset2:
-                        cell.cset = cset1
-
                 self._maze[coord1].set_visited()
                 self._maze[coord2].set_visited()
-                self.visited.emit(coord1)
-                self.visited.emit(coord2)
+                if observer:
+                    observer.visited(coord1)
+                    observer.visited(coord2)
+                    # The step is shown for the whole pause
+                    self._sleep()
 
         return len(walls) == 0
 
@@ -79,10 +72,11 @@ if __name__ == '__main__':
         display_step = True
 
         alg = RandomizedKruskal(maze)
+        observer = None
         if display_step:
-            alg.visited.connect(lambda coord: display(maze, coord))
+            observer = GeneratorObserver(visited=lambda coord: display(maze, coord))
 
-        alg.run(.2)
+        alg.run(.2, observer)
 
         # print(' ')
         # maze.print()
@@ -1,9 +1,10 @@
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QPainter, QPalette
-from PySide6.QtWidgets import QMainWindow, QGraphicsScene, QGraphicsView
+from PySide6.QtWidgets import QMainWindow, QGraphicsScene
 
 from mazegenerator import CELL_SIZE, MAZE_COLUMNS, MAZE_ROWS
 from mazegenerator.qmainwidget import QMainWidget
+from mazegenerator.qmazeview import QMazeView
 
 #
 # DEBUG = False
@@ -36,7 +37,7 @@ class MainWindow(QMainWindow):
         print(SCENE_WIDTH, SCENE_HEIGHT)
         self.scene = QGraphicsScene(0, 0, SCENE_WIDTH, SCENE_HEIGHT)
 
-        self.view = QGraphicsView(self.scene)
+        self.view = QMazeView(self.scene)
         self.view.setRenderHint(QPainter.RenderHint.Antialiasing)
         self.view.setInteractive(False)
         self.view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
@@ -1,48 +1,103 @@
+from array import array
+import mmap
+import os
 import sys
 
-from mazegenerator import Direction
+from mazegenerator import Direction, mazefile
 
 _HEADER_LEN = 2
 
+_ALL_WALLS = Direction.NORTH | Direction.SOUTH | Direction.EAST | Direction.WEST
+
+# Plain int masks of the walls in maze.walls, faster than IntFlag arithmetic in the hot paths
+NORTH = Direction.NORTH.value
+SOUTH = Direction.SOUTH.value
+WEST = Direction.WEST.value
+EAST = Direction.EAST.value
+
+# Maze.print lookup tables
+_NORTH_BIT = bytes(1 if w & NORTH else 0 for w in range(256))
+_WEST_BIT = bytes(1 if w & WEST else 0 for w in range(256))
+# Junction between 4 cells and the north wall of the cell on its south-east, by key:
+# 1 north wall of the cell, 2 north wall of the west neighbor,
+# 4 west wall of the cell, 8 west wall of the north neighbor
+_JUNCTIONS = [glyph + ('───' if key & 1 else '   ')
+              for key, glyph in enumerate(' ╶╴─╷┌┐┬╵└┘┴|├┤┼')]
+# West wall and blank middle of the cells but the first of a row, by walls
+_WEST_EDGES = [('|' if w & WEST else ' ') + '   ' for w in range(256)]
+
+
+def index_typecode(size: int) -> str:
+    """
+        Array typecode for cell indexes (or distances) of size cells, with room for -1:
+        4 bytes per item unless there are more than 2**31 - 1 cells
+    """
+    return 'i' if size < 2 ** 31 else 'q'
+
 
 class _MazeCell:
+    """
+        Lightweight view over a single cell of a Maze.
+        The cell state lives in the flat buffers of the Maze, so views are cheap
+        to create and can be thrown away after use.
+    """
+
+    __slots__ = ('_maze', '_index')
 
-    def __init__(self):
-        self._visited = False
-        self._walls = Direction.NORTH | Direction.SOUTH | Direction.EAST | Direction.WEST
+    def __init__(self, maze, index):
+        self._maze = maze
+        self._index = index
+
+    @property
+    def walls(self) -> Direction:
+        return Direction(self._maze._walls[self._index])  # pylint: disable=protected-access
 
     def is_visited(self) -> bool:
-        return self._visited
+        return self._maze._visited[self._index] > 0  # pylint: disable=protected-access
 
     def set_visited(self, flag=True):
-        self._visited = flag
+        self._maze._visited[self._index] = flag  # pylint: disable=protected-access
 
     def has_wall(self, direction: Direction) -> bool:
-        # print(self._walls & direction > 0)
-        return self._walls & direction > 0
+        return self._maze._walls[self._index] & direction > 0  # pylint: disable=protected-access
 
     def remove_wall(self, direction: Direction):
-        self._walls &= ~direction
+        self._maze._walls[self._index] &= ~direction  # pylint: disable=protected-access
 
 
 class Maze:
+    """
+        Walls and visited flags of every cell are stored in flat bytearrays
+        indexed by columns * row + column.
+        maze[column, row] returns a _MazeCell view over those buffers.
 
-    def __init__(self, columns: int, rows: int):
+        walls can be an existing buffer of columns * rows bytes, by default all the walls are up.
+    """
+
+    def __init__(self, columns: int, rows: int, walls=None):
         self._columns = columns
         self._rows = rows
+        self.seed = None
 
         # self._start = (-1, -1)
         # self._finish = (-1, -1)
 
-        self._cells = [_MazeCell() for _ in range(rows * columns)]
+        if walls is None:
+            walls = bytearray([_ALL_WALLS]) * (rows * columns)
+        self._walls = walls
+        self._visited = None
+        self.clear_visited()
 
     def __getitem__(self, coord):
         column, row = coord
-        return self._cells[self._columns * row + column]
+        return _MazeCell(self, self._columns * row + column)
 
     def __iter__(self):
-        for cell in self._cells:
-            yield cell
+        for i in range(len(self._walls)):
+            yield _MazeCell(self, i)
+
+    def __len__(self):
+        return len(self._walls)
 
     @property
     def columns(self):
@@ -52,6 +107,42 @@ class Maze:
     def rows(self):
         return self._rows
 
+    @property
+    def walls(self) -> bytearray:
+        """The flat buffer of the wall bits (a Direction mask per cell)"""
+        return self._walls
+
+    def index(self, coord: (int, int)) -> int:
+        column, row = coord
+        return self._columns * row + column
+
+    def coord(self, index: int) -> (int, int):
+        row, column = divmod(index, self._columns)
+        return (column, row)
+
+    def passage_offsets(self) -> list:
+        """
+            For each of the 16 wall configurations, the index offsets of the neighbors
+            reachable through the open sides: maze.walls[i] -> offsets of the cells next to i.
+            Border walls are expected to be up.
+        """
+        directions = ((NORTH, -self._columns), (SOUTH, self._columns), (WEST, -1), (EAST, 1))
+        return [tuple(offset for direction, offset in directions if not walls & direction)
+                for walls in range(16)]
+
+    def new_buffer(self, typecode=None, value=0) -> array:
+        """
+            Return a flat array with an item per cell, initialized to value.
+            Algorithms use it to keep their own per cell fields (distances, sets, ...)
+            The default typecode holds any cell index or distance (see index_typecode).
+        """
+        if typecode is None:
+            typecode = index_typecode(len(self._walls))
+        return array(typecode, [value]) * len(self._walls)
+
+    def clear_visited(self):
+        self._visited = bytearray(len(self._walls))
+
     # @property
     # def start(self) -> (int, int):
     #     return self._start
@@ -87,168 +178,125 @@ class Maze:
 
     def neighbors(self, coord: (int, int), include_visited=True):
         column, row = coord
+        visited = self._visited
+        i = self._columns * row + column
         neighbors = []
-        if row > 0 and (include_visited or not self[column, row - 1].is_visited()):
+        if row > 0 and (include_visited or not visited[i - self._columns]):
             neighbors.append((column, row - 1))
-        if row < self._rows - 1 and (include_visited or not self[column, row + 1].is_visited()):
+        if row < self._rows - 1 and (include_visited or not visited[i + self._columns]):
             neighbors.append((column, row + 1))
-        if column > 0 and (include_visited or not self[column - 1, row].is_visited()):
+        if column > 0 and (include_visited or not visited[i - 1]):
             neighbors.append((column - 1, row))
-        if column < self._columns - 1 and (include_visited or not self[column + 1, row].is_visited()):
+        if column < self._columns - 1 and (include_visited or not visited[i + 1]):
             neighbors.append((column + 1, row))
         return neighbors
 
     def visitable_neighbors(self, coord: (int, int), include_visited=True):
         column, row = coord
+        visited = self._visited
+        i = self._columns * row + column
+        walls = self._walls[i]
         neighbors = []
-        if row > 0 and not self[column, row].has_wall(Direction.NORTH) \
-                   and (include_visited or not self[column, row - 1].is_visited()):
+        if row > 0 and not walls & NORTH \
+                   and (include_visited or not visited[i - self._columns]):
             neighbors.append((column, row - 1))
-        if row < self._rows - 1 and not self[column, row].has_wall(Direction.SOUTH) \
-                               and (include_visited or not self[column, row + 1].is_visited()):
+        if row < self._rows - 1 and not walls & SOUTH \
+                               and (include_visited or not visited[i + self._columns]):
             neighbors.append((column, row + 1))
-        if column > 0 and not self[column, row].has_wall(Direction.WEST) \
-                      and (include_visited or not self[column - 1, row].is_visited()):
+        if column > 0 and not walls & WEST \
+                      and (include_visited or not visited[i - 1]):
             neighbors.append((column - 1, row))
-        if column < self._columns - 1 and not self[column, row].has_wall(Direction.EAST)\
-                                     and (include_visited or not self[column + 1, row].is_visited()):
+        if column < self._columns - 1 and not walls & EAST \
+                                     and (include_visited or not visited[i + 1]):
             neighbors.append((column + 1, row))
         return neighbors
 
     def crave_passage(self, from_coord, to_coord):
         fc, fr = from_coord
         tc, tr = to_coord
+        fi = self._columns * fr + fc
+        ti = self._columns * tr + tc
         if fc == tc:
             if fr < tr:
-                self[from_coord].remove_wall(Direction.SOUTH)
-                self[to_coord].remove_wall(Direction.NORTH)
+                self._walls[fi] &= ~SOUTH
+                self._walls[ti] &= ~NORTH
                 return
             if fr > tr:
-                self[from_coord].remove_wall(Direction.NORTH)
-                self[to_coord].remove_wall(Direction.SOUTH)
+                self._walls[fi] &= ~NORTH
+                self._walls[ti] &= ~SOUTH
                 return
         else:
             if fc < tc:
-                self[from_coord].remove_wall(Direction.EAST)
-                self[to_coord].remove_wall(Direction.WEST)
+                self._walls[fi] &= ~EAST
+                self._walls[ti] &= ~WEST
                 return
             if fc > tc:
-                self[from_coord].remove_wall(Direction.WEST)
-                self[to_coord].remove_wall(Direction.EAST)
+                self._walls[fi] &= ~WEST
+                self._walls[ti] &= ~EAST
                 return
 
-    def print(self, fn_w=lambda _coord: ' '):  # pylint: disable=too-many-branches
-
-        # First row
-        for row in range(0, self._rows):
-            # draw the north edge
-            for column in range(0, self._columns):
-                if column == 0 and row == 0:
-                    sys.stdout.write('╔═══')
-                elif row == 0:
-                    if self[(column, row)].has_wall(Direction.WEST):
-                        sys.stdout.write('╤═══')
-                    else:
-                        sys.stdout.write('════')
-                else:
-                    # row > 0 -----------------------------
-                    if column == 0:
-                        if self[(column, row)].has_wall(Direction.NORTH):
-                            sys.stdout.write('╟')
-                        else:
-                            sys.stdout.write('║')
-                    else:
-                        self._print_flag(column, row)
-
-                    if self[(column, row)].has_wall(Direction.NORTH):
-                        sys.stdout.write('───')
-                    else:
-                        sys.stdout.write('   ')
-            if row == 0:
-                sys.stdout.write('╗\n')
-            else:
-                if self[(self._columns - 1, row)].has_wall(Direction.NORTH):
-                    sys.stdout.write('╢\n')
-                else:
-                    sys.stdout.write('║\n')
-
-            # draw the west edge
-            for column in range(0, self._columns):
-                if self[(column, row)].has_wall(Direction.WEST):
-                    if column == 0:
-                        sys.stdout.write('║')
-                    else:
-                        sys.stdout.write('|')
-                else:
-                    sys.stdout.write(' ')
-                # if self[(column, row)].is_visited():
-                #     sys.stdout.write('   ')
-                # else:
-                sys.stdout.write(f' {fn_w((column, row))} ')
-            sys.stdout.write('║\n')
-
-        # draw the bottom line
-        sys.stdout.write('╚═══')
-        for column in range(1, self._columns):
-            if self[(column, self._rows - 1)].has_wall(Direction.WEST):
-                sys.stdout.write('╧═══')
+    def print(self, fn_w=None, file=None):
+        """
+            Draw the maze with box-drawing characters on file (default: sys.stdout) with a single write.
+            fn_w(coord) returns the character to draw in the middle of each cell.
+        """
+        if file is None:
+            file = sys.stdout
+        file.write(self.to_text(fn_w))
+
+    def to_text(self, fn_w=None) -> str:
+        return ''.join(self._text_lines(fn_w))
+
+    def _text_lines(self, fn_w=None):
+        """ The lines of the drawing of the maze, built a row of cells at a time from lookup tables """
+        columns = self._columns
+        walls = self._walls
+
+        # Walls to the north and to the west of every cell, as the bits of the _JUNCTIONS keys
+        north = bytes(walls[0:columns]).translate(_NORTH_BIT)
+        line = ['╔═══']
+        line.extend('╤═══' if w & WEST else '════' for w in walls[1:columns])
+        line.append('╗\n')
+        yield ''.join(line)
+
+        for row in range(self._rows):
+            i = columns * row
+            row_walls = bytes(walls[i:i + columns])
+            if row > 0:
+                north = row_walls.translate(_NORTH_BIT)
+                # For the junction at the north-west corner of each cell but the first:
+                # north wall of the cell, of the west neighbor, west wall of the cell, of the north neighbor
+                keys = (int.from_bytes(north[1:], 'big')
+                        | int.from_bytes(north[:-1], 'big') << 1
+                        | int.from_bytes(row_walls[1:].translate(_WEST_BIT), 'big') << 2
+                        | int.from_bytes(bytes(walls[i - columns + 1:i]).translate(_WEST_BIT), 'big') << 3
+                        ).to_bytes(columns - 1, 'big')
+                line = ['╟───' if north[0] else '║   ']
+                line.extend(map(_JUNCTIONS.__getitem__, keys))
+                line.append('╢\n' if north[-1] else '║\n')
+                yield ''.join(line)
+
+            line = ['║' if row_walls[0] & WEST else ' ']
+            if fn_w is None:
+                line.append('   ')
+                line.extend(map(_WEST_EDGES.__getitem__, row_walls[1:]))
             else:
-                sys.stdout.write('════')
-        print('╝')
-
-    def _print_flag(self, column, row):  # pylint: disable=too-many-branches
-        # row > 0 and column > 0 ----------
-        flag = 0
-        if self[(column, row)].has_wall(Direction.NORTH):
-            flag += 1
-        if self[(column - 1, row)].has_wall(Direction.NORTH):
-            flag += 10
-        if self[(column, row)].has_wall(Direction.WEST):
-            flag += 100
-        if self[(column, row - 1)].has_wall(Direction.WEST):
-            flag += 1000
-
-        if flag == 0:
-            sys.stdout.write(' ')
-        elif flag == 1:
-            sys.stdout.write('╶')
-        elif flag == 10:
-            sys.stdout.write('╴')
-        elif flag == 11:
-            sys.stdout.write('─')
-        elif flag == 100:
-            sys.stdout.write('╷')
-        elif flag == 101:
-            sys.stdout.write('┌')
-        elif flag == 110:
-            sys.stdout.write('┐')
-        elif flag == 111:
-            sys.stdout.write('┬')
-        elif flag == 1000:
-            sys.stdout.write('╵')
-        elif flag == 1001:
-            sys.stdout.write('└')
-        elif flag == 1010:
-            sys.stdout.write('┘')
-        elif flag == 1011:
-            sys.stdout.write('┴')
-        elif flag == 1100:
-            sys.stdout.write('|')
-        elif flag == 1101:
-            sys.stdout.write('├')
-        elif flag == 1110:
-            sys.stdout.write('┤')
-        elif flag == 1111:
-            sys.stdout.write('┼')
-        else:
-            raise ValueError(f"Unexpected flag: {flag}")
+                line.append(f' {fn_w((0, row))} ')
+                for column in range(1, columns):
+                    line.append('|' if row_walls[column] & WEST else ' ')
+                    line.append(f' {fn_w((column, row))} ')
+            line.append('║\n')
+            yield ''.join(line)
+
+        # the bottom line
+        i = columns * (self._rows - 1)
+        line = ['╚═══']
+        line.extend('╧═══' if w & WEST else '════' for w in walls[i + 1:i + columns])
+        line.append('╝\n')
+        yield ''.join(line)
 
     def __repr__(self):
-        rpr = f'Maze[{self._columns},{self._rows}'  # ,{self.start[1]},{self.start[2]}'
-        for cell in self._cells:
-            rpr += f',{cell._walls}'
-        rpr += ']'
-        return rpr
+        return f'Maze[{self._columns},{self._rows},{",".join(map(str, self._walls))}]'
 
     @staticmethod
     def from_str(s):
@@ -257,16 +305,131 @@ class Maze:
         i1 = s.find('[') + 1  # pylint: disable=invalid-name
         i2 = s.find(']')  # pylint: disable=invalid-name
         l = s[i1: i2].split(',')  # pylint: disable=invalid-name
-        l = [int(x) for x in l]  # pylint: disable=invalid-name
+        l = list(map(int, l))  # pylint: disable=invalid-name
         assert len(l) > _HEADER_LEN, 'Not a valid source string for a Maze'
         columns = l[0]
         rows = l[1]
         assert len(l) == (columns * rows + _HEADER_LEN), 'Not a valid source string for a Maze'
 
-        maze = Maze(columns, rows)
+        maze = Maze(columns, rows, bytearray(l[_HEADER_LEN:]))
         # maze.start = (l[2], l[3])
 
-        for i, cell in enumerate(maze._cells):  # pylint: disable=protected-access
-            cell._walls = Direction(l[i + _HEADER_LEN])  # pylint: disable=protected-access
+        return maze
+
+    def to_bytes(self, unpacked=False) -> bytes:
+        """
+            Serialize the maze in the compact binary format described in mazegenerator.mazefile.
+            Unpacked data stores a byte per cell, see MappedMaze.
+        """
+        if unpacked:
+            header = mazefile.pack_header(self._columns, self._rows, self.seed, mazefile.FLAG_UNPACKED)
+            return header + bytes(self._walls)
+        return mazefile.pack_header(self._columns, self._rows, self.seed) + mazefile.pack_walls(self._walls)
+
+    @staticmethod
+    def from_bytes(data):
+        columns, rows, seed, flags = mazefile.unpack_header(data)
+        body = memoryview(data)[mazefile.HEADER.size:]
+        if rows == 0 and flags & mazefile.FLAG_UNPACKED:
+            rows = mazefile.streamed_rows(columns, len(body))
+
+        maze = Maze(columns, rows, mazefile.unpack_walls(body, columns * rows, flags))
+        maze.seed = seed
 
         return maze
+
+    def save(self, file, unpacked=False):
+        """ file is a path or a binary file object """
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, 'wb') as f:
+                f.write(self.to_bytes(unpacked))
+        else:
+            file.write(self.to_bytes(unpacked))
+
+    @staticmethod
+    def load(file):
+        """
+            file is a path or a binary file object.
+            A file object can hold several mazes one after the other, each call reads the next one
+            and raises EOFError when there are no more mazes.
+        """
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, 'rb') as f:
+                return Maze.from_bytes(f.read())
+
+        header = file.read(mazefile.HEADER.size)
+        if not header:
+            raise EOFError('No more mazes in the file')
+        columns, rows, _seed, flags = mazefile.unpack_header(header)
+        if rows == 0 and flags & mazefile.FLAG_UNPACKED:
+            return Maze.from_bytes(header + file.read())
+        return Maze.from_bytes(header + file.read(mazefile.body_size(columns * rows, flags)))
+
+
+class MappedMaze(Maze):
+    """
+        Maze backed by a memory-mapped unpacked maze file (see mazegenerator.mazefile).
+        Walls are read and written directly in the file, so the maze doesn't need to fit in memory.
+        Visited flags live in an anonymous mapping, its pages are allocated only when they are touched.
+
+        Use create() or open(), and close() the maze when done (or use it as a context manager).
+    """
+
+    def __init__(self, mapping: mmap.mmap, writable=True):
+        columns, rows, seed, flags = mazefile.unpack_header(mapping)
+        if not flags & mazefile.FLAG_UNPACKED:
+            raise ValueError('Only unpacked maze files can be memory-mapped')
+        if rows == 0:
+            rows = mazefile.streamed_rows(columns, len(mapping) - mazefile.HEADER.size)
+        end = mazefile.HEADER.size + columns * rows
+        if len(mapping) < end:
+            raise ValueError('Not a valid maze file: truncated body')
+
+        self._mmap = mapping
+        self._writable = writable
+        super().__init__(columns, rows, memoryview(mapping)[mazefile.HEADER.size:end])
+        self.seed = seed
+
+    @staticmethod
+    def create(path, columns: int, rows: int, seed=None):
+        """ Create an unpacked maze file with all the walls up, and map it """
+        with open(path, 'wb') as f:
+            f.write(mazefile.pack_header(columns, rows, seed, mazefile.FLAG_UNPACKED))
+            row = bytes([_ALL_WALLS]) * columns
+            for _ in range(rows):
+                f.write(row)
+        return MappedMaze.open(path)
+
+    @staticmethod
+    def open(path, writable=True):
+        # The mapping keeps its own handle, the file can be closed
+        with open(path, 'r+b' if writable else 'rb') as f:
+            access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+            mapping = mmap.mmap(f.fileno(), 0, access=access)
+        return MappedMaze(mapping, writable)
+
+    def clear_visited(self):
+        if self._visited is not None:
+            self._visited.close()
+        self._visited = mmap.mmap(-1, len(self._walls))
+
+    def flush(self):
+        """ Write the header (the seed could have changed) and the walls to the file """
+        if self._writable:
+            header = mazefile.pack_header(self._columns, self._rows, self.seed, mazefile.FLAG_UNPACKED)
+            self._mmap[:mazefile.HEADER.size] = header
+            self._mmap.flush()
+
+    def close(self):
+        if self._mmap.closed:
+            return
+        self.flush()
+        self._walls.release()
+        self._mmap.close()
+        self._visited.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
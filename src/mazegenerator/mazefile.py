@@ -0,0 +1,117 @@
+"""
+    Compact binary format of a Maze.
+
+    Header, 24 bytes, little endian:
+        magic     4s    b'MAZE'
+        version   B     1
+        flags     B     FLAG_SEED if the seed field holds the seed of the maze
+                        FLAG_UNPACKED if the body holds one byte per cell
+        padding   2x
+        columns   I
+        rows      I
+        seed      q
+
+    Body: the wall bits of the cells, in the order columns * row + column,
+          packed in nibbles, two cells per byte: even cells in the low nibble, odd cells in the high one.
+          Unpacked files store a byte per cell instead: they are twice as big,
+          but the body can be memory-mapped and used directly as the wall buffer of a Maze.
+          Unpacked files written by write_rows() to a stream that can't be rewound have rows 0 in the header:
+          the body holds as many rows as the rest of the file.
+"""
+import struct
+
+MAGIC = b'MAZE'
+VERSION = 1
+
+FLAG_SEED = 1
+FLAG_UNPACKED = 2
+
+HEADER = struct.Struct('<4sBB2xIIq')
+
+_SEED_MIN = -2 ** 63
+_SEED_MAX = 2 ** 63 - 1
+
+_TO_HIGH_NIBBLE = bytes((i << 4) & 0xff for i in range(256))
+_FROM_LOW_NIBBLE = bytes(i & 0x0f for i in range(256))
+_FROM_HIGH_NIBBLE = bytes(i >> 4 for i in range(256))
+
+
+def body_size(cells: int, flags=0) -> int:
+    if flags & FLAG_UNPACKED:
+        return cells
+    return (cells + 1) // 2
+
+
+def pack_header(columns: int, rows: int, seed=None, flags=0) -> bytes:
+    if isinstance(seed, int) and _SEED_MIN <= seed <= _SEED_MAX:
+        flags |= FLAG_SEED
+    else:
+        seed = 0
+    return HEADER.pack(MAGIC, VERSION, flags, columns, rows, seed)
+
+
+def unpack_header(data) -> (int, int, int, int):
+    """ Return (columns, rows, seed, flags), seed is None if it is not stored """
+    if len(data) < HEADER.size:
+        raise ValueError('Not a valid maze file: truncated header')
+    magic, version, flags, columns, rows, seed = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError('Not a valid maze file: wrong magic number')
+    if version != VERSION:
+        raise ValueError(f'Unsupported maze file version: {version}')
+    if not flags & FLAG_SEED:
+        seed = None
+    return columns, rows, seed, flags
+
+
+def streamed_rows(columns: int, body_length: int) -> int:
+    """ The number of rows of a file written with rows 0 in the header """
+    return body_length // columns
+
+
+def write_rows(stream, columns: int, rows_iter, seed=None, rows=None) -> int:
+    """
+        Write an unpacked maze file to a binary stream, a row at a time from rows_iter.
+        If rows is None the header says 0 rows and, if the stream is seekable,
+        it is rewritten with the actual number of rows at the end.
+        Return the number of rows written.
+    """
+    seekable = rows is None and stream.seekable()
+    if seekable:
+        start = stream.tell()
+    stream.write(pack_header(columns, rows or 0, seed, FLAG_UNPACKED))
+
+    count = 0
+    for row in rows_iter:
+        stream.write(row)
+        count += 1
+
+    if seekable:
+        end = stream.tell()
+        stream.seek(start)
+        stream.write(pack_header(columns, count, seed, FLAG_UNPACKED))
+        stream.seek(end)
+
+    return count
+
+
+def pack_walls(walls) -> bytes:
+    low = bytes(walls[0::2])
+    high = bytes(walls[1::2]).translate(_TO_HIGH_NIBBLE)
+    # OR-ing the two byte strings as big integers keeps the loop in C
+    packed = int.from_bytes(low, 'little') | int.from_bytes(high, 'little')
+    return packed.to_bytes(len(low), 'little')
+
+
+def unpack_walls(data, cells: int, flags=0) -> bytearray:
+    size = body_size(cells, flags)
+    if len(data) < size:
+        raise ValueError('Not a valid maze file: truncated body')
+    if flags & FLAG_UNPACKED:
+        return bytearray(data[:size])
+
+    data = bytes(data[:size])
+    walls = bytearray(cells)
+    walls[0::2] = data.translate(_FROM_LOW_NIBBLE)
+    walls[1::2] = data[:cells // 2].translate(_FROM_HIGH_NIBBLE)
+    return walls
@@ -1,12 +1,13 @@
 from enum import Enum
 from typing import overload
 
-from PySide6.QtCore import Qt, QPoint
-from PySide6.QtGui import QPen, QBrush, QColor
+from PySide6.QtCore import Qt, QPoint, QRectF, QLineF
+from PySide6.QtGui import QPen, QBrush, QColor, QImage
 from PySide6.QtWidgets import QGraphicsItemGroup, QGraphicsLineItem, \
     QGraphicsItem, QGraphicsRectItem
 
 from mazegenerator import Direction
+from mazegenerator.maze import Maze, NORTH, SOUTH, WEST, EAST
 
 COLOR_NOT_VISITED_BACKGROUND = QColor('#131926')
 COLOR_TOVISIT_BACKGROUND = QColor('#5252ba')
@@ -158,3 +159,225 @@ class QGraphicsItemCell(QGraphicsItemGroup, QGraphicsGridPItem):
         pen = QPen(COLOR_END_OF_PATH)
         pen.setWidth(2)
         self.center.setPen(pen)
+
+
+# Path marks of QGraphicsMazeItem, stored with the CellStatus value of a cell
+_IN_PATH = 8
+_START_OF_PATH = 16
+_END_OF_PATH = 32
+
+# Below this size on screen (in pixels) a cell is drawn from the cached image instead of with vector lines
+_LOD_CELL_PIXELS = 6
+
+# Color table of the cached image, index 0 is the wall
+_IMAGE_COLORS = [COLOR_WALL, COLOR_NOT_VISITED_BACKGROUND, COLOR_TOVISIT_BACKGROUND,
+                 COLOR_VISITING_BACKGROUND, COLOR_VISITED_BACKGROUND, COLOR_INPATH_BACKGROUND,
+                 COLOR_START_OF_PATH, COLOR_END_OF_PATH]
+
+
+def _color_index(status: int) -> int:
+    """ Index in _IMAGE_COLORS of the background of a cell """
+    if status & _END_OF_PATH:
+        return 7
+    if status & _START_OF_PATH:
+        return 6
+    if status & _IN_PATH:
+        return 5
+    backgrounds = {CellStatus.TOVISIT.value: 2, CellStatus.VISITING.value: 3, CellStatus.VISITED.value: 4}
+    return backgrounds.get(status, 1)
+
+
+# The image pixels of a cell from its key, (color index << 4) | walls:
+# the cell itself and the passages to the east and to the south, walls are index 0
+_CELL_PIXEL = bytes(key >> 4 for key in range(256))
+_EAST_PIXEL = bytes(0 if key & EAST else key >> 4 for key in range(256))
+_SOUTH_PIXEL = bytes(0 if key & SOUTH else key >> 4 for key in range(256))
+_SHIFTED_COLOR = bytes((_color_index(status) << 4) & 0xff for status in range(256))
+
+
+class QGraphicsMazeItem(QGraphicsItem):
+    """
+        The whole maze in a single item.
+        paint() draws the cells in the exposed rect straight from the wall buffer of the maze,
+        the status of the cells is kept in a bytearray.
+        Changing a cell only invalidates its own rect.
+
+        Level of detail: when a cell is smaller than _LOD_CELL_PIXELS on screen the maze is drawn
+        from a cached image with 2 pixels per cell (the cell and its east/south passage or wall),
+        kept up to date cell by cell. When zoomed in the walls are drawn as lines.
+    """
+
+    def __init__(self, maze: Maze, cell_size, w_offset, h_offset):
+        super().__init__()
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+
+        self.maze = maze
+        self.cell_size = cell_size
+        self.w_offset = w_offset
+        self.h_offset = h_offset
+        self._status = bytearray(len(maze))
+        self._image = None
+
+        self._wall_pen = QPen(COLOR_WALL)
+        self._wall_pen.setWidthF(min(2, cell_size / 4))
+        self._margin = self._wall_pen.widthF()
+
+    def boundingRect(self) -> QRectF:
+        return QRectF(self.w_offset, self.h_offset,
+                      self.maze.columns * self.cell_size,
+                      self.maze.rows * self.cell_size).adjusted(-self._margin, -self._margin,
+                                                                self._margin, self._margin)
+
+    def cell_rect(self, coord: (int, int)) -> QRectF:
+        column, row = coord
+        return QRectF(self.w_offset + column * self.cell_size, self.h_offset + row * self.cell_size,
+                      self.cell_size, self.cell_size)
+
+    def _visible_cells(self, rect: QRectF):
+        """ The range of columns and rows intersecting rect, one more cell on every side """
+        columns = self.maze.columns
+        rows = self.maze.rows
+        first_column = max(0, int((rect.left() - self.w_offset) / self.cell_size) - 1)
+        last_column = min(columns, int((rect.right() - self.w_offset) / self.cell_size) + 2)
+        first_row = max(0, int((rect.top() - self.h_offset) / self.cell_size) - 1)
+        last_row = min(rows, int((rect.bottom() - self.h_offset) / self.cell_size) + 2)
+        return range(first_column, last_column), range(first_row, last_row)
+
+    def paint(self, painter, option, widget=None):  # pylint: disable=unused-argument
+        visible_columns, visible_rows = self._visible_cells(option.exposedRect)
+        if not visible_columns or not visible_rows:
+            return
+
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        if lod * self.cell_size < _LOD_CELL_PIXELS:
+            self._paint_image(painter, visible_columns, visible_rows)
+        else:
+            self._paint_backgrounds(painter, visible_columns, visible_rows)
+            self._paint_walls(painter, visible_columns, visible_rows)
+
+    def _paint_image(self, painter, visible_columns, visible_rows):
+        if self._image is None:
+            self._image = self._build_image()
+
+        # The image is 2 * columns + 1 pixels wide, stretched over the maze
+        x_scale = self.maze.columns * self.cell_size / self._image.width()
+        y_scale = self.maze.rows * self.cell_size / self._image.height()
+        source = QRectF(2 * visible_columns.start, 2 * visible_rows.start,
+                        2 * len(visible_columns) + 1, 2 * len(visible_rows) + 1)
+        target = QRectF(self.w_offset + source.x() * x_scale, self.h_offset + source.y() * y_scale,
+                        source.width() * x_scale, source.height() * y_scale)
+        painter.drawImage(target, self._image, source)
+
+    def _paint_backgrounds(self, painter, visible_columns, visible_rows):
+        """ A rect for each run of cells of the same color in a row """
+        columns = self.maze.columns
+        status = self._status
+        size = self.cell_size
+        for row in visible_rows:
+            y = self.h_offset + row * size
+            i = columns * row
+            start = visible_columns.start
+            for column in range(start + 1, visible_columns.stop + 1):
+                if column == visible_columns.stop or status[i + column] != status[i + start]:
+                    painter.fillRect(QRectF(self.w_offset + start * size, y, (column - start) * size, size),
+                                     _IMAGE_COLORS[_color_index(status[i + start])])
+                    start = column
+
+    def _paint_walls(self, painter, visible_columns, visible_rows):
+        """ North and west walls of every cell, plus the east and south sides of the maze """
+        columns = self.maze.columns
+        rows = self.maze.rows
+        walls = self.maze.walls
+        size = self.cell_size
+        lines = []
+        for row in visible_rows:
+            y = self.h_offset + row * size
+            i = columns * row
+            for column in visible_columns:
+                cell_walls = walls[i + column]
+                x = self.w_offset + column * size
+                if cell_walls & NORTH:
+                    lines.append(QLineF(x, y, x + size, y))
+                if cell_walls & WEST:
+                    lines.append(QLineF(x, y, x, y + size))
+                if column == columns - 1 and cell_walls & EAST:
+                    lines.append(QLineF(x + size, y, x + size, y + size))
+                if row == rows - 1 and cell_walls & SOUTH:
+                    lines.append(QLineF(x, y + size, x + size, y + size))
+        painter.setPen(self._wall_pen)
+        painter.drawLines(lines)
+
+    def _build_image(self) -> QImage:
+        """ The whole maze as an indexed image, a row of cells at a time """
+        columns = self.maze.columns
+        rows = self.maze.rows
+        width = 2 * columns + 1
+        image = QImage(width, 2 * rows + 1, QImage.Format_Indexed8)
+        image.setColorTable([color.rgb() for color in _IMAGE_COLORS])
+        image.fill(0)
+
+        stride = image.bytesPerLine()
+        bits = image.bits()
+        for row in range(rows):
+            i = columns * row
+            colors = self._status[i:i + columns].translate(_SHIFTED_COLOR)
+            walls = bytes(self.maze.walls[i:i + columns])
+            keys = (int.from_bytes(colors, 'big') | int.from_bytes(walls, 'big')).to_bytes(columns, 'big')
+
+            line = (2 * row + 1) * stride
+            bits[line + 1:line + width:2] = keys.translate(_CELL_PIXEL)
+            bits[line + 2:line + width:2] = keys.translate(_EAST_PIXEL)
+            bits[line + stride + 1:line + stride + width:2] = keys.translate(_SOUTH_PIXEL)
+        return image
+
+    def _key(self, i: int) -> int:
+        return (_SHIFTED_COLOR[self._status[i]]) | (self.maze.walls[i] & 0x0f)
+
+    def _update_image(self, coord: (int, int)):
+        """ The pixels of the cell and the passages to its four neighbors """
+        column, row = coord
+        i = self.maze.index(coord)
+        key = self._key(i)
+        x = 2 * column + 1
+        y = 2 * row + 1
+        image = self._image
+        image.setPixel(x, y, _CELL_PIXEL[key])
+        image.setPixel(x + 1, y, _EAST_PIXEL[key])
+        image.setPixel(x, y + 1, _SOUTH_PIXEL[key])
+        if column > 0:
+            image.setPixel(x - 1, y, _EAST_PIXEL[self._key(i - 1)])
+        if row > 0:
+            image.setPixel(x, y - 1, _SOUTH_PIXEL[self._key(i - self.maze.columns)])
+
+    def update_cell(self, coord: (int, int)):
+        """ Repaint the cell, e.g. after its walls changed """
+        if self._image is not None:
+            self._update_image(coord)
+        self.update(self.cell_rect(coord).adjusted(-self._margin, -self._margin, self._margin, self._margin))
+
+    def set_status(self, coord: (int, int), status: CellStatus):
+        if status is not None:
+            self._status[self.maze.index(coord)] = status.value
+        self.update_cell(coord)
+
+    def _mark(self, coord: (int, int), mark):
+        self._status[self.maze.index(coord)] |= mark
+        self.update_cell(coord)
+
+    def set_in_path(self, coord: (int, int)):
+        self._mark(coord, _IN_PATH)
+
+    def set_start_path(self, coord: (int, int)):
+        self._mark(coord, _START_OF_PATH)
+
+    def set_end_path(self, coord: (int, int)):
+        self._mark(coord, _END_OF_PATH)
+
+    def set_path(self, path: list):
+        """ Mark a whole path and repaint once """
+        for coord in path:
+            self._status[self.maze.index(coord)] |= _IN_PATH
+        self._status[self.maze.index(path[0])] |= _START_OF_PATH
+        self._status[self.maze.index(path[-1])] |= _END_OF_PATH
+        self._image = None
+        self.update()
@@ -9,12 +9,13 @@ from PySide6.QtWidgets import QWidget, QGridLayout, QLabel, QComboBox, \
     QPushButton, QSpinBox, QGraphicsLineItem, QStyle, QCheckBox
 
 from mazegenerator.bfslonghestpath import BfsLonghestPath
+from mazegenerator.generator.abstractgenerator import BatchObserver, TOVISIT, VISITING, VISITED
 from mazegenerator.generator.eller import Eller
 from mazegenerator.generator.randomizedbreadthfirst import RandomizedBreadthFirst
 from mazegenerator.generator.randomizeddepthfirst import RandomizedDepthFirst
 from mazegenerator.generator.randomizedkruskal import RandomizedKruskal
 from mazegenerator.maze import Maze
-from mazegenerator.qgraphicsgrid import QGraphicsItemCell, CellStatus
+from mazegenerator.qgraphicsgrid import QGraphicsMazeItem, CellStatus
 
 
 class RunningStatus(Enum):
@@ -26,6 +27,7 @@ class RunningStatus(Enum):
 _DEFAULT_W = 45
 _DEFAULT_H = 35
 _DEFAULT_SPEED = 50
+_MAX_SIZE = 2000
 
 # _DEFAULT_W = 4
 # _DEFAULT_H = 4
@@ -94,13 +96,13 @@ class QMainWidget(QWidget):
         layout.addWidget(QLabel("Size:"), 4, 0)
         self.spinbox_w = QSpinBox()
         self.spinbox_w.setMinimum(3)
-        self.spinbox_w.setMaximum(100)
+        self.spinbox_w.setMaximum(_MAX_SIZE)
         self.spinbox_w.setValue(_DEFAULT_W)
         # self.spinbox_w.setEnabled(False)
         self.spinbox_w.valueChanged.connect(self._init_maze)
         self.spinbox_h = QSpinBox()
         self.spinbox_h.setMinimum(3)
-        self.spinbox_h.setMaximum(100)
+        self.spinbox_h.setMaximum(_MAX_SIZE)
         self.spinbox_h.setValue(_DEFAULT_H)
         # self.spinbox_h.setEnabled(False)
         self.spinbox_h.valueChanged.connect(self._init_maze)
@@ -213,21 +215,17 @@ class QMainWidget(QWidget):
         w = self.spinbox_w.value()
 
         self.maze = Maze(w, h)
+        self.view.reset_zoom()
 
-        max_cell_width = int(scene_width / self.maze.columns)
-        max_cell_heigth = int(scene_height / self.maze.rows)
-        cell_size = min(max_cell_width, max_cell_heigth)
+        # Whole pixels while they fit, fractions of pixel for the large mazes (see the zoom of the view)
+        cell_size = min(scene_width / self.maze.columns, scene_height / self.maze.rows)
+        if cell_size >= 1:
+            cell_size = int(cell_size)
         w_offset = int((scene_width - self.maze.columns * cell_size) / 2)
         h_offset = int((scene_height - self.maze.rows * cell_size) / 2)
 
-        self.cells = []
-        for row in range(0, self.maze.rows):
-            for column in range(0, self.maze.columns):
-
-                cell = QGraphicsItemCell(cell_size, w_offset, h_offset)
-                cell.setGridPos(column, row)
-                self.scene.addItem(cell)
-                self.cells.append(cell)
+        self.maze_item = QGraphicsMazeItem(self.maze, cell_size, w_offset, h_offset)
+        self.scene.addItem(self.maze_item)
 
     def _set_status(self, status: RunningStatus):
         self._running_status = status
@@ -263,8 +261,8 @@ class QMainWidget(QWidget):
             self._worker.set_speed(speed)
 
     def _get_speed(self):
+        # 0 runs at full speed, the worker sends the progress in batches anyway
         speed = self.spinbox_speed.value()
-        speed = max(speed, 1)
         speed = speed / 1000.0
         return speed
 
@@ -278,9 +276,7 @@ class QMainWidget(QWidget):
             algtype = self.combobox.currentData()
             speed = self._get_speed()
             self._worker = Worker(self.maze, speed, algtype)
-            self._worker.signals.tovisit.connect(self._tovisit)
-            self._worker.signals.visiting.connect(self._visiting)
-            self._worker.signals.visited.connect(self._visited)
+            self._worker.signals.updates.connect(self._apply_updates)
             self._worker.signals.finished.connect(self._worker_finished)
             self.threadpool.start(self._worker)
         elif self._running_status == RunningStatus.PAUSED:
@@ -313,27 +309,24 @@ class QMainWidget(QWidget):
                 path = bfs.run()
                 print(f'BFS: {path}')
                 print(f'     lenght: {len(path)}')
-                for coord in path:
-                    self.cells[self.maze.columns * coord[1] + coord[0]].set_in_path()
-                coord = path[0]
-                self.cells[self.maze.columns * coord[1] + coord[0]].set_start_path()
-                coord = path[len(path) - 1]
-                self.cells[self.maze.columns * coord[1] + coord[0]].set_end_path()
-
-    def _tovisit(self, coord):
-        column, row = coord
-        self.cells[self.maze.columns * row + column].set_status(self.maze[coord], CellStatus.TOVISIT)
-
-    def _visiting(self, coord):
-        column, row = coord
-        self.cells[self.maze.columns * row + column].set_status(self.maze[coord], CellStatus.VISITING)
-
-    def _visited(self, coord):
-        column, row = coord
-        self.cells[self.maze.columns * row + column].set_status(self.maze[coord], CellStatus.VISITED)
-        for neighbor in self.maze.neighbors(coord):
-            column, row = neighbor
-            self.cells[self.maze.columns * row + column].set_status(self.maze[neighbor], None)
+                self.maze_item.set_path(path)
+
+    def _apply_updates(self, updates):
+        """
+            Apply a batch of (status, coord) coming from the worker.
+            Every cell is redrawn once, with the last status it got in the batch.
+        """
+        statuses = {TOVISIT: CellStatus.TOVISIT, VISITING: CellStatus.VISITING, VISITED: CellStatus.VISITED}
+        cells = {}
+        for status, coord in updates:
+            cells[coord] = statuses[status]
+            if status == VISITED:
+                # The passages carved into the neighbors
+                for neighbor in self.maze.neighbors(coord):
+                    cells.setdefault(neighbor, None)
+
+        for coord, status in cells.items():
+            self.maze_item.set_status(coord, status)
 
 
 class Worker(QRunnable):
@@ -357,21 +350,20 @@ class Worker(QRunnable):
         else:
             raise ValueError(f"Unknown alorithm type: {algtype}")
 
-        self._alg.tovisit.connect(self.signals.tovisit.emit)
-        self._alg.visiting.connect(self.signals.visiting.emit)
-        self._alg.visited.connect(self.signals.visited.emit)
-        # self._alg.finished.connect(self.signals.finished.emit)
+        # Coalesce the steps into a signal per frame, one signal per step floods the event queue
+        self._observer = BatchObserver(self.signals.updates.emit)
 
     @Slot()
     def run(self):
         complete = False
         try:
-            complete = self._alg.run(self._speed)
+            complete = self._alg.run(self._speed, self._observer)
         except:  # pylint: disable=bare-except
             traceback.print_exc()
             exctype, value = sys.exc_info()[:2]
             self.signals.error.emit((exctype, value, traceback.format_exc()))
         finally:
+            self._observer.flush()
             self.signals.finished.emit(complete)  # Done
 
     @Slot(int)
@@ -400,6 +392,9 @@ class WorkerSignals(QObject):
     finished
         No data
 
+    updates
+        list of (status, coord) of the steps done since the previous batch
+
     error
         tuple (exctype, value, traceback.format_exc() )
 
@@ -411,7 +406,5 @@ class WorkerSignals(QObject):
 
     '''
     error = Signal(tuple)
-    tovisit = Signal(tuple)
-    visiting = Signal(tuple)
-    visited = Signal(tuple)
+    updates = Signal(list)
     finished = Signal(bool)
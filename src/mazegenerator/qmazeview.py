@@ -0,0 +1,30 @@
+from PySide6.QtWidgets import QGraphicsView
+
+_ZOOM_STEP = 1.25
+_MAX_ZOOM = 64
+
+
+class QMazeView(QGraphicsView):
+    """
+        QGraphicsView with zoom (mouse wheel, around the cursor) and pan (dragging).
+        At zoom 1 the whole scene is visible, it's not possible to zoom out further.
+    """
+
+    def __init__(self, scene):
+        super().__init__(scene)
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+        self.setDragMode(QGraphicsView.ScrollHandDrag)
+        self._zoom = 1.0
+
+    def wheelEvent(self, event):
+        if event.angleDelta().y() > 0:
+            zoom = min(self._zoom * _ZOOM_STEP, _MAX_ZOOM)
+        else:
+            zoom = max(self._zoom / _ZOOM_STEP, 1.0)
+        factor = zoom / self._zoom
+        self._zoom = zoom
+        self.scale(factor, factor)
+
+    def reset_zoom(self):
+        self.resetTransform()
+        self._zoom = 1.0
@@ -0,0 +1,196 @@
+"""
+    Headless raster export of mazes, without building a QGraphicsScene.
+
+    A maze of columns x rows cells becomes an image of (2 * columns + 1) x (2 * rows + 1) pixels:
+    a pixel per cell, a pixel per wall (or passage) between two cells and a pixel per corner.
+    The image is produced a row of pixels at a time in one pass over the wall buffer,
+    each row built with bytes.translate over the walls of a row of cells, so large mazes
+    (5000x5000 and more) are written in a few seconds without holding the whole image in memory.
+
+    Pixels are palette indexes: PASSAGE, WALL and PATH (the optional solver path, PNG and QImage only).
+    scale repeats every pixel scale times in both directions.
+
+        python -m mazegenerator export mazes.bin maze.png --path --scale 4
+"""
+import struct
+import zlib
+
+from mazegenerator.maze import Maze, NORTH, SOUTH, WEST, EAST
+
+PASSAGE = 0
+WALL = 1
+PATH = 2
+
+PALETTE = [(0xff, 0xff, 0xff), (0x00, 0x00, 0x00), (0xd0, 0x20, 0x20)]
+
+# Path marks of a cell, stored above the wall bits: the cell is on the path,
+# the passage to the north / west neighbor is on the path
+_ON_PATH = 16
+_NORTH_ON_PATH = 32
+_WEST_ON_PATH = 64
+
+
+def _table(pixel) -> bytes:
+    return bytes(pixel(key) for key in range(256))
+
+
+# Pixels of a cell from its key (marks | walls)
+_CELL_PIXEL = _table(lambda key: PATH if key & _ON_PATH else PASSAGE)
+_NORTH_PIXEL = _table(lambda key: WALL if key & NORTH else PATH if key & _NORTH_ON_PATH else PASSAGE)
+_WEST_PIXEL = _table(lambda key: WALL if key & WEST else PATH if key & _WEST_ON_PATH else PASSAGE)
+_EAST_PIXEL = _table(lambda key: WALL if key & EAST else PASSAGE)
+_SOUTH_PIXEL = _table(lambda key: WALL if key & SOUTH else PASSAGE)
+
+_PBM_DIGITS = _table(lambda pixel: ord('1') if pixel == WALL else ord('0'))
+_PNG_DIGITS = _table(lambda pixel: ord('0') + min(pixel, 3))
+
+
+def image_size(maze: Maze, scale=1) -> (int, int):
+    if scale < 1:
+        raise ValueError(f'The scale must be at least 1: {scale}')
+    return ((2 * maze.columns + 1) * scale, (2 * maze.rows + 1) * scale)
+
+
+def _path_marks(maze: Maze, path) -> bytearray:
+    marks = bytearray(len(maze))
+    previous = None
+    for coord in path:
+        i = maze.index(coord)
+        marks[i] |= _ON_PATH
+        if previous is not None:
+            # The passage belongs to the cell below or on the right
+            if i - previous == maze.columns:
+                marks[i] |= _NORTH_ON_PATH
+            elif previous - i == maze.columns:
+                marks[previous] |= _NORTH_ON_PATH
+            elif i - previous == 1:
+                marks[i] |= _WEST_ON_PATH
+            elif previous - i == 1:
+                marks[previous] |= _WEST_ON_PATH
+        previous = i
+    return marks
+
+
+def _scaled(line: bytearray, scale: int) -> bytes:
+    if scale == 1:
+        return bytes(line)
+    scaled = bytearray(len(line) * scale)
+    for k in range(scale):
+        scaled[k::scale] = line
+    return bytes(scaled)
+
+
+def raster_rows(maze: Maze, path=None, scale=1):
+    """ Yield the rows of pixels of the maze, top to bottom, as bytes of palette indexes """
+    columns = maze.columns
+    width = 2 * columns + 1
+    walls = maze.walls
+    marks = _path_marks(maze, path) if path else None
+
+    # Corners are always walls
+    wall_line = bytearray([WALL]) * width
+    cell_line = bytearray(width)
+    keys = b''
+    for row in range(maze.rows):
+        i = columns * row
+        keys = bytes(walls[i:i + columns])
+        if marks is not None:
+            keys = (int.from_bytes(keys, 'big')
+                    | int.from_bytes(marks[i:i + columns], 'big')).to_bytes(columns, 'big')
+
+        wall_line[1::2] = keys.translate(_NORTH_PIXEL)
+        cell_line[0:-1:2] = keys.translate(_WEST_PIXEL)
+        cell_line[1::2] = keys.translate(_CELL_PIXEL)
+        cell_line[-1] = _EAST_PIXEL[keys[-1]]
+
+        line = _scaled(wall_line, scale)
+        for _ in range(scale):
+            yield line
+        line = _scaled(cell_line, scale)
+        for _ in range(scale):
+            yield line
+
+    wall_line[1::2] = keys.translate(_SOUTH_PIXEL)
+    line = _scaled(wall_line, scale)
+    for _ in range(scale):
+        yield line
+
+
+def write_pbm(stream, maze: Maze, scale=1):
+    """ Binary PBM (P4), walls are black """
+    width, height = image_size(maze, scale)
+    padding = b'0' * (-width % 8)
+    row_bytes = (width + 7) // 8
+    stream.write(b'P4\n%d %d\n' % (width, height))
+    for line in raster_rows(maze, scale=scale):
+        stream.write(int(line.translate(_PBM_DIGITS) + padding, 2).to_bytes(row_bytes, 'big'))
+
+
+def _png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    crc = zlib.crc32(chunk_type + data)
+    return struct.pack('>I', len(data)) + chunk_type + data + struct.pack('>I', crc)
+
+
+def write_png(stream, maze: Maze, path=None, scale=1, level=1):
+    """
+        2 bit palette PNG, the compressed data is written as it's produced.
+        Low compression levels are much faster and the files only slightly larger.
+    """
+    width, height = image_size(maze, scale)
+    padding = b'0' * (-width % 4)
+    row_bytes = (width + 3) // 4
+    stream.write(b'\x89PNG\r\n\x1a\n')
+    stream.write(_png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 2, 3, 0, 0, 0)))
+    stream.write(_png_chunk(b'PLTE', b''.join(bytes(color) for color in PALETTE)))
+
+    compressor = zlib.compressobj(level)
+    pending = []
+    pending_size = 0
+    for line in raster_rows(maze, path, scale):
+        # 4 pixels per byte: the pixels read as the digits of a base 4 number
+        packed = int(line.translate(_PNG_DIGITS) + padding, 4).to_bytes(row_bytes, 'big')
+        data = compressor.compress(b'\x00' + packed)  # filter type None
+        if data:
+            pending.append(data)
+            pending_size += len(data)
+            if pending_size >= 1 << 20:
+                stream.write(_png_chunk(b'IDAT', b''.join(pending)))
+                pending = []
+                pending_size = 0
+    pending.append(compressor.flush())
+    stream.write(_png_chunk(b'IDAT', b''.join(pending)))
+    stream.write(_png_chunk(b'IEND', b''))
+
+
+def to_qimage(maze: Maze, path=None, scale=1):
+    """ The maze as an indexed QImage, it doesn't need a running QApplication """
+    from PySide6.QtGui import QImage  # pylint: disable=import-outside-toplevel
+
+    width, height = image_size(maze, scale)
+    image = QImage(width, height, QImage.Format_Indexed8)
+    image.setColorTable([0xff000000 | (r << 16) | (g << 8) | b for r, g, b in PALETTE])
+    stride = image.bytesPerLine()
+    bits = image.bits()
+    for y, line in enumerate(raster_rows(maze, path, scale)):
+        bits[y * stride:y * stride + width] = line
+    return image
+
+
+def export(maze: Maze, file, image_format=None, path=None, scale=1):
+    """
+        Write the maze to file (a path or a binary file object) as 'png' or 'pbm',
+        by default the format comes from the suffix of the file name.
+    """
+    if image_format is None:
+        image_format = 'pbm' if str(file).lower().endswith('.pbm') else 'png'
+    if image_format not in ('png', 'pbm'):
+        raise ValueError(f'Unknown image format: {image_format}')
+    # Before the file is created
+    image_size(maze, scale)
+    if isinstance(file, (str, bytes)) or hasattr(file, '__fspath__'):
+        with open(file, 'wb') as f:
+            export(maze, f, image_format, path, scale)
+    elif image_format == 'pbm':
+        write_pbm(file, maze, scale)
+    else:
+        write_png(file, maze, path, scale)
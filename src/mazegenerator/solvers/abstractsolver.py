@@ -0,0 +1,44 @@
+import time
+from typing import NamedTuple
+
+from mazegenerator.maze import Maze
+
+
+class SolverResult(NamedTuple):
+    path: list  # cells from start to goal, empty if the goal can't be reached
+    expanded: int  # number of cells expanded by the solver
+    elapsed: float  # wall-clock time in seconds
+
+
+class AbstractSolver:
+    """
+        Base class of the shortest path solvers.
+
+        Solvers work on cell indexes (columns * row + column).
+        The wall byte of a cell is its adjacency bitmask:
+        maze.passage_offsets() maps it to the index offsets of the reachable neighbors.
+    """
+
+    def __init__(self, maze: Maze):
+        self._maze = maze
+        self._passages = maze.passage_offsets()
+
+    def solve(self, start: (int, int), goal: (int, int)) -> SolverResult:
+        begin = time.perf_counter()
+        path, expanded = self._solve(self._maze.index(start), self._maze.index(goal))
+        elapsed = time.perf_counter() - begin
+        return SolverResult([self._maze.coord(i) for i in path], expanded, elapsed)
+
+    def _solve(self, start: int, goal: int) -> (list, int):
+        """ Return the cell indexes of the path and the number of expanded cells """
+        raise NotImplementedError('To be implemented.')
+
+    @staticmethod
+    def _build_path(parent, start: int, goal: int) -> list:
+        path = [goal]
+        i = goal
+        while i != start:
+            i = parent[i]
+            path.append(i)
+        path.reverse()
+        return path
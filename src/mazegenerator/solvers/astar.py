@@ -0,0 +1,40 @@
+import heapq
+from typing import override
+
+from mazegenerator.solvers.abstractsolver import AbstractSolver
+
+
+class AStar(AbstractSolver):
+    """ A* search with the Manhattan distance to the goal as heuristic """
+
+    @override
+    def _solve(self, start: int, goal: int) -> (list, int):  # pylint: disable=too-many-locals
+        walls = self._maze.walls
+        passages = self._passages
+        columns = self._maze.columns
+        goal_row, goal_column = divmod(goal, columns)
+
+        cost = self._maze.new_buffer(value=-1)
+        parent = self._maze.new_buffer(value=-1)
+        cost[start] = 0
+
+        expanded = 0
+        to_visit = [(0, 0, start)]
+        while to_visit:
+            _f, g, i = heapq.heappop(to_visit)
+            if i == goal:
+                return self._build_path(parent, start, goal), expanded
+            if g > cost[i]:
+                continue  # A stale entry, the cell was reached again with a lower cost
+            expanded += 1
+
+            g += 1
+            for offset in passages[walls[i]]:
+                j = i + offset
+                if cost[j] < 0 or g < cost[j]:
+                    cost[j] = g
+                    parent[j] = i
+                    row, column = divmod(j, columns)
+                    heapq.heappush(to_visit, (g + abs(row - goal_row) + abs(column - goal_column), g, j))
+
+        return [], expanded
@@ -0,0 +1,61 @@
+from typing import override
+
+from mazegenerator.solvers.abstractsolver import AbstractSolver
+
+_FROM_START = 1
+_FROM_GOAL = 2
+
+
+class BidirectionalBfs(AbstractSolver):
+    """
+        Two breadth-first visits, from the start and from the goal, one level at a time,
+        always expanding the smaller frontier, until they meet.
+    """
+
+    @override
+    def _solve(self, start: int, goal: int) -> (list, int):
+        if start == goal:
+            return [start], 0
+
+        walls = self._maze.walls
+        passages = self._passages
+
+        side = bytearray(len(self._maze))  # which visit reached the cell
+        parent = self._maze.new_buffer(value=-1)
+        side[start] = _FROM_START
+        side[goal] = _FROM_GOAL
+
+        frontiers = {_FROM_START: [start], _FROM_GOAL: [goal]}
+        expanded = 0
+        while frontiers[_FROM_START] and frontiers[_FROM_GOAL]:
+            if len(frontiers[_FROM_START]) <= len(frontiers[_FROM_GOAL]):
+                current, other = _FROM_START, _FROM_GOAL
+            else:
+                current, other = _FROM_GOAL, _FROM_START
+
+            next_frontier = []
+            for i in frontiers[current]:
+                expanded += 1
+                for offset in passages[walls[i]]:
+                    j = i + offset
+                    if side[j] == 0:
+                        side[j] = current
+                        parent[j] = i
+                        next_frontier.append(j)
+                    elif side[j] == other:
+                        if current == _FROM_START:
+                            return self._join(parent, start, goal, i, j), expanded
+                        return self._join(parent, start, goal, j, i), expanded
+            frontiers[current] = next_frontier
+
+        return [], expanded
+
+    def _join(self, parent, start, goal, start_side, goal_side):
+        """ Path through start_side (reached from start) and its neighbor goal_side (reached from goal) """
+        path = self._build_path(parent, start, start_side)
+        i = goal_side
+        path.append(i)
+        while i != goal:
+            i = parent[i]
+            path.append(i)
+        return path
@@ -0,0 +1,55 @@
+from typing import override
+
+from mazegenerator.solvers.abstractsolver import AbstractSolver
+
+# Number of open sides of each wall configuration, as a bytes.translate table
+_DEGREE = bytes(4 - bin(walls & 0x0f).count('1') for walls in range(256))
+
+
+class DeadEndFilling(AbstractSolver):
+    """
+        Fills every dead end, and the corridors leading to it, until only the cells
+        on the paths between start and goal are left, then follows them.
+        In a perfect maze the cells left are exactly the solution.
+    """
+
+    @override
+    def _solve(self, start: int, goal: int) -> (list, int):
+        walls = self._maze.walls
+        passages = self._passages
+
+        degree = bytearray(bytes(walls).translate(_DEGREE))
+        filled = bytearray(len(self._maze))
+
+        expanded = 0
+        to_fill = [i for i, d in enumerate(degree) if d <= 1 and i not in (start, goal)]
+        while to_fill:
+            i = to_fill.pop()
+            filled[i] = 1
+            expanded += 1
+            for offset in passages[walls[i]]:
+                j = i + offset
+                if not filled[j]:
+                    degree[j] -= 1
+                    if degree[j] == 1 and j != start and j != goal:
+                        to_fill.append(j)
+
+        # Follow the cells left, a breadth-first visit in case the maze has loops
+        parent = self._maze.new_buffer(value=-1)
+        filled[start] = 1
+        to_visit = [start]
+        while to_visit:
+            next_to_visit = []
+            for i in to_visit:
+                if i == goal:
+                    return self._build_path(parent, start, goal), expanded
+                expanded += 1
+                for offset in passages[walls[i]]:
+                    j = i + offset
+                    if not filled[j]:
+                        filled[j] = 1
+                        parent[j] = i
+                        next_to_visit.append(j)
+            to_visit = next_to_visit
+
+        return [], expanded
@@ -0,0 +1,94 @@
+"""
+    Vectorized operations over the wall buffer of a Maze.
+
+    The walls are seen as a (rows, columns) uint8 NumPy array sharing memory with maze.walls,
+    so carving edges in bulk, counting dead ends or checking that neighbours agree on the wall
+    between them run at array speed.
+    NumPy is only needed by this module, the rest of the package works without it.
+"""
+import numpy as np
+
+from mazegenerator.maze import Maze, NORTH, SOUTH, WEST, EAST
+
+# Number of open sides for each of the 16 wall configurations
+_DEGREE = np.array([4 - bin(walls).count('1') for walls in range(16)], dtype=np.uint8)
+
+
+def wall_grid(maze: Maze) -> np.ndarray:
+    """
+        The walls of maze as a (rows, columns) uint8 array.
+        It's a view over maze.walls: changes to one are visible in the other.
+    """
+    return np.frombuffer(maze.walls, dtype=np.uint8).reshape(maze.rows, maze.columns)
+
+
+def carve_edges(maze: Maze, cells1, cells2):
+    """
+        Remove the walls between cells1[k] and cells2[k] for every k.
+        cells1 and cells2 are arrays of flat cell indexes (columns * row + column) of adjacent cells.
+    """
+    cells1 = np.asarray(cells1, dtype=np.int64)
+    cells2 = np.asarray(cells2, dtype=np.int64)
+    if cells1.shape != cells2.shape:
+        raise ValueError('Edge arrays must have the same shape')
+
+    # Orient every edge from the upper/left cell so only east and south passages are left
+    first = np.minimum(cells1, cells2)
+    second = np.maximum(cells1, cells2)
+    delta = second - first
+    east = (delta == 1) & (second % maze.columns != 0)
+    south = delta == maze.columns
+    if not np.all(east | south) or (first.size and (first.min() < 0 or second.max() >= len(maze))):
+        raise ValueError('Edges must join adjacent cells of the maze')
+
+    walls = wall_grid(maze).reshape(-1)
+    # ufunc.at because a cell can appear in several edges
+    np.bitwise_and.at(walls, first[east], np.uint8(~EAST & 0xff))
+    np.bitwise_and.at(walls, second[east], np.uint8(~WEST & 0xff))
+    np.bitwise_and.at(walls, first[south], np.uint8(~SOUTH & 0xff))
+    np.bitwise_and.at(walls, second[south], np.uint8(~NORTH & 0xff))
+
+
+def degrees(maze: Maze) -> np.ndarray:
+    """ The number of open sides of every cell, as a (rows, columns) array """
+    return _DEGREE[wall_grid(maze) & 0x0f]
+
+
+def degree_histogram(maze: Maze) -> np.ndarray:
+    """ histogram[d] is the number of cells with d open sides, for d in 0..4 """
+    return np.bincount(degrees(maze).reshape(-1), minlength=5)
+
+
+def dead_ends(maze: Maze) -> int:
+    return int(np.count_nonzero(degrees(maze) == 1))
+
+
+def wall_mismatches(maze: Maze) -> np.ndarray:
+    """
+        The flat indexes of the cells whose walls disagree with the maze:
+        an east/south wall differing from the west/north wall of the neighbour,
+        or a missing wall on the border.
+    """
+    grid = wall_grid(maze)
+    bad = np.zeros(grid.shape, dtype=bool)
+
+    east = (grid[:, :-1] & EAST) > 0
+    west = (grid[:, 1:] & WEST) > 0
+    bad[:, :-1] |= east != west
+    bad[:, 1:] |= east != west
+
+    south = (grid[:-1, :] & SOUTH) > 0
+    north = (grid[1:, :] & NORTH) > 0
+    bad[:-1, :] |= south != north
+    bad[1:, :] |= south != north
+
+    bad[0, :] |= (grid[0, :] & NORTH) == 0
+    bad[-1, :] |= (grid[-1, :] & SOUTH) == 0
+    bad[:, 0] |= (grid[:, 0] & WEST) == 0
+    bad[:, -1] |= (grid[:, -1] & EAST) == 0
+
+    return np.flatnonzero(bad)
+
+
+def is_consistent(maze: Maze) -> bool:
+    return wall_mismatches(maze).size == 0
@@ -1,7 +1,5 @@
 from enum import Enum
 
-from PySide6.QtCore import QPoint
-
 CELL_SIZE = 32
 
 
@@ -18,15 +16,16 @@ def find_first_last_occurrence(char, s):
     return first, last
 
 
-def next_point(point: QPoint, direction: Direction) -> QPoint:
+def next_point(point: (int, int), direction: Direction) -> (int, int):
+    column, row = point
     if direction == Direction.RIGHT:
-        return QPoint(point.x() + 1, point.y())
+        return (column + 1, row)
     elif direction == Direction.LEFT:
-        return QPoint(point.x() - 1, point.y())
+        return (column - 1, row)
     elif direction == Direction.DOWN:
-        return QPoint(point.x(), point.y() + 1)
+        return (column, row + 1)
     elif direction == Direction.UP:
-        return QPoint(point.x(), point.y() - 1)
+        return (column, row - 1)
 
     # Impossible but just to silence pylin
     raise ValueError(f"Unknown direction: {direction}")
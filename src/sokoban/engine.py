@@ -0,0 +1,102 @@
+"""
+    Rules of Sokoban, without Qt: a Game is the state of a level being played
+    with moves, pushes, undo, redo and the completion check.
+    The Qt window (sokoban.main) only draws what the Game reports.
+
+    Solutions are strings in LURD notation (see sokoban.gamestate),
+    validate_solution checks one against a level:
+
+        validate_solution(get_level('Microban', 0).txtlevel, 'dlUrrrdLullddrUluRuulDrddrruLdlUU')
+"""
+from typing import NamedTuple
+
+from sokoban import Direction
+from sokoban.gamestate import DIRECTIONS, GameState
+from sokoban.levels import Level
+
+
+class Step(NamedTuple):
+    """ A move of the player, positions are (column, row). box_from and box_to are None without a push """
+    char: str
+    player_from: tuple
+    player_to: tuple
+    box_from: tuple
+    box_to: tuple
+
+
+class Game:
+
+    def __init__(self, level: Level):
+        self.level = level
+        self.state = level.new_state()
+        self._redo = []
+
+    @property
+    def player(self) -> (int, int):
+        return self.state.coord(self.state.player)
+
+    @property
+    def boxes(self) -> list:
+        return [self.state.coord(i) for i in self.state.box_indexes()]
+
+    @property
+    def moves(self) -> str:
+        """ The moves played so far in LURD notation """
+        return ''.join(self.state.moves)
+
+    @property
+    def pushes(self) -> int:
+        return sum(1 for char in self.state.moves if char.isupper())
+
+    def is_box(self, position: (int, int)) -> bool:
+        return self.state.is_box(self.state.index(*position))
+
+    def is_goal(self, position: (int, int)) -> bool:
+        return self.state.is_goal(self.state.index(*position))
+
+    def is_completed(self) -> bool:
+        return self.state.is_completed()
+
+    def _step(self, char: str, player_from: int) -> Step:
+        player_to = player_from + self.state.offsets[DIRECTIONS[char.lower()]]
+        if char.isupper():
+            box_to = player_to + player_to - player_from
+            return Step(char, self.state.coord(player_from), self.state.coord(player_to),
+                        self.state.coord(player_to), self.state.coord(box_to))
+        return Step(char, self.state.coord(player_from), self.state.coord(player_to), None, None)
+
+    def move(self, direction: Direction) -> Step:
+        """ Move the player (pushing a box), None if it's not possible. A new move clears the redo list """
+        player_from = self.state.player
+        char = self.state.move(direction)
+        if char is None:
+            return None
+        self._redo.clear()
+        return self._step(char, player_from)
+
+    def undo(self) -> Step:
+        """ Take back the last move, return it (as it was played) or None if there are no moves """
+        char = self.state.undo()
+        if char is None:
+            return None
+        self._redo.append(char)
+        return self._step(char, self.state.player)
+
+    def redo(self) -> Step:
+        """ Play again the last move taken back, None if there is nothing to redo """
+        if not self._redo:
+            return None
+        char = self._redo.pop()
+        player_from = self.state.player
+        self.state.move(DIRECTIONS[char.lower()])
+        return self._step(char, player_from)
+
+    def restart(self):
+        self.state = self.level.new_state()
+        self._redo.clear()
+
+
+def validate_solution(txtlevel: list, solution: str) -> bool:
+    """ True if the moves of solution (LURD notation) are all possible and complete the level """
+    state = GameState(txtlevel)
+    return state.play(solution) and state.is_completed()
@@ -0,0 +1,161 @@
+"""
+    Bitboard state of a Sokoban level, it does not depend on Qt.
+
+    Every cell of the level is a bit of an integer, at index row * stride + column.
+    stride is columns + 1: the extra column on the right is always a wall,
+    so shifting a bitset by one never wraps a cell into the next row.
+
+    walls, goals and boxes are bitsets, the player is a cell index.
+    A move or a push flips a couple of bits, undo flips them back,
+    and the level is completed when boxes & ~goals is 0.
+
+    Moves are recorded in LURD notation: l, u, r, d for a move, L, U, R, D for a push.
+"""
+from sokoban import Direction
+
+LURD = {Direction.LEFT: 'l', Direction.UP: 'u', Direction.RIGHT: 'r', Direction.DOWN: 'd'}
+DIRECTIONS = {char: direction for direction, char in LURD.items()}
+
+_WALL_CHARS = '#'
+_PLAYER_CHARS = '@+Pp'
+_BOX_CHARS = '$*Bb'
+_GOAL_CHARS = '.*+BP'
+
+
+class GameState:
+
+    def __init__(self, txtlevel: list, columns=None, rows=None):
+        if columns is None:
+            columns = max(len(line) for line in txtlevel)
+        if rows is None:
+            rows = len(txtlevel)
+        self.columns = columns
+        self.rows = rows
+        self.stride = columns + 1
+
+        self.walls = 0
+        self.goals = 0
+        self.boxes = 0
+        self.player = -1
+        for row in range(rows):
+            # The sentinel column, and the cells past the end of a short line, are walls
+            line = txtlevel[row].ljust(columns, '#') if row < len(txtlevel) else '#' * columns
+            for column, ch in enumerate(line[:columns] + '#'):
+                bit = 1 << (row * self.stride + column)
+                if ch in _WALL_CHARS:
+                    self.walls |= bit
+                if ch in _PLAYER_CHARS:
+                    self.player = row * self.stride + column
+                if ch in _BOX_CHARS:
+                    self.boxes |= bit
+                if ch in _GOAL_CHARS:
+                    self.goals |= bit
+        if self.player < 0:
+            raise ValueError('No player in the level')
+
+        self._cells = (1 << (rows * self.stride)) - 1
+        self._not_goals = ~self.goals
+        self.offsets = {Direction.LEFT: -1, Direction.RIGHT: 1,
+                        Direction.UP: -self.stride, Direction.DOWN: self.stride}
+        self.floor = self._flood(1 << self.player, self.walls)
+        self.moves = []
+
+    def _flood(self, start: int, obstacles: int) -> int:
+        """ The cells reachable from the start bits without crossing the obstacles """
+        free = self._cells & ~obstacles
+        stride = self.stride
+        reached = start
+        while True:
+            grown = (reached | reached << 1 | reached >> 1 | reached << stride | reached >> stride) & free
+            if grown == reached:
+                return reached
+            reached = grown
+
+    def index(self, column: int, row: int) -> int:
+        return row * self.stride + column
+
+    def coord(self, index: int) -> (int, int):
+        row, column = divmod(index, self.stride)
+        return (column, row)
+
+    def is_wall(self, index: int) -> bool:
+        return self.walls >> index & 1 == 1
+
+    def is_goal(self, index: int) -> bool:
+        return self.goals >> index & 1 == 1
+
+    def is_box(self, index: int) -> bool:
+        return self.boxes >> index & 1 == 1
+
+    def is_floor(self, index: int) -> bool:
+        """ Inside the level: reachable from the start position of the player, ignoring the boxes """
+        return self.floor >> index & 1 == 1
+
+    def box_indexes(self) -> list:
+        boxes = self.boxes
+        indexes = []
+        while boxes:
+            low = boxes & -boxes
+            indexes.append(low.bit_length() - 1)
+            boxes ^= low
+        return indexes
+
+    def move(self, direction: Direction) -> str:
+        """
+            Move the player, pushing the box in front of it if there is one.
+            Return the LURD char of the move, None if it's blocked.
+        """
+        offset = self.offsets[direction]
+        target = self.player + offset
+        bit = 1 << target
+        if self.walls & bit:
+            return None
+
+        char = LURD[direction]
+        if self.boxes & bit:
+            beyond = bit << offset if offset > 0 else bit >> -offset
+            if (self.walls | self.boxes) & beyond:
+                return None
+            self.boxes ^= bit | beyond
+            char = char.upper()
+
+        self.player = target
+        self.moves.append(char)
+        return char
+
+    def undo(self) -> str:
+        """ Take back the last move, return its LURD char or None if there are no moves """
+        if not self.moves:
+            return None
+
+        char = self.moves.pop()
+        offset = self.offsets[DIRECTIONS[char.lower()]]
+        if char.isupper():
+            # The box is in front of the player, it goes back where the player is
+            box = self.player + offset
+            self.boxes ^= 1 << box | 1 << self.player
+        self.player -= offset
+        return char
+
+    def play(self, lurd: str) -> bool:
+        """
+            Play a sequence of moves in LURD notation.
+            Stop at the first move that is blocked, not a LURD char, or that doesn't match
+            its push flag (the case of the char), leaving the state as it was before it.
+        """
+        for char in lurd:
+            if char.lower() not in DIRECTIONS:
+                return False
+            done = self.move(DIRECTIONS[char.lower()])
+            if done != char:
+                if done is not None:
+                    self.undo()
+                return False
+        return True
+
+    def is_completed(self) -> bool:
+        return self.boxes & self._not_goals == 0
+
+    def key(self) -> (int, int):
+        """ Hashable position: the boxes and the player """
+        return (self.boxes, self.player)
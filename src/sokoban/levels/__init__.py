@@ -1,8 +1,7 @@
 from typing import overload
 
-from PySide6.QtCore import QPoint
-
-from sokoban import Direction, next_point
+from sokoban.gamestate import GameState
+from sokoban.leveltables import LevelTables
 
 from sokoban.levels import microban
 from sokoban.levels import sasquatch
@@ -11,132 +10,53 @@ from sokoban.levels import testlevels
 
 
 class Level():
+    """
+        The static description of a level, positions are (column, row).
+        The state of a game (player, boxes, moves) is in sokoban.engine.Game.
+        tables are the precomputed dead squares, push distances and areas (see sokoban.leveltables).
+    """
 
     def __init__(self, columns, rows, txtlevel):
         self.columns = columns
         self.rows = rows
+        self.txtlevel = txtlevel
 
-        self.player_start = QPoint()
-        self.floor = []
-        self.boxes_start = []
-        self.boxes = []
-        self.goals = []
-        self.reachables = []
-
-        self.__parse_txtlevel(txtlevel)
-
-    def __parse_txtlevel(self, txtlevel):
-        for r, line in enumerate(txtlevel):
-            floor = ''
-            # for c in range(0, len(line)):
-            for c, ch in enumerate(line):
-                # Floor
-                if ch == '#':
-                    floor += '#'
-                else:
-                    floor += ' '
-
-                # Player
-                if ch in ['@', '+', 'P', 'p']:
-                    self.player_start.setX(c)
-                    self.player_start.setY(r)
-
-                # boxs
-                if ch in ['$', '*', 'B', 'b']:
-                    self.boxes_start.append(QPoint(c, r))
-                    self.boxes.append(QPoint(c, r))
+        self._start = GameState(txtlevel, columns, rows)
+        self.floor = [''.join('#' if ch == '#' else ' ' for ch in line).ljust(columns) for line in txtlevel]
 
-                # Goals
-                if ch in ['.', '*', '+', 'B', 'P']:
-                    self.goals.append(QPoint(c, r))
+        self.player_start = self._start.coord(self._start.player)
+        self.boxes_start = [self._start.coord(i) for i in self._start.box_indexes()]
+        self.goals = [self._start.coord(i) for i in range(self.rows * self._start.stride)
+                      if self._start.is_goal(i)]
+        self.tables = LevelTables(self._start)
 
-            self.floor.append(floor.ljust(self.columns))
-
-        self._build_reachables()
+    def new_state(self) -> GameState:
+        """ The state at the start of the level """
+        return GameState(self.txtlevel, self.columns, self.rows)
 
     @overload
     def is_wall(self, column: int, row: int) -> None:
         ...
 
     @overload
-    def is_wall(self, position: QPoint) -> None:
+    def is_wall(self, position: (int, int)) -> None:
         ...
 
     def is_wall(self, column, row=None):
-        if isinstance(column, QPoint):
-            position = column
-            column = position.x()
-            row = position.y()
+        if row is None:
+            column, row = column
 
         return self.floor[row][column] == '#'
 
-    def is_box(self, position: QPoint) -> bool:
-        return position in self.boxes
-
-    def is_box_on_target(self, position: QPoint) -> bool:
-        assert self.is_box(position), "Not a box"
-
-        return position in self.goals
-
-    def is_empty(self, position: QPoint) -> bool:
-        return not self.is_wall(position) and not self.is_box(position)
-
-    def can_push(self, position: QPoint, direction: Direction) -> bool:
-        assert self.is_box(position), "Not a box"
-
-        return self.is_empty(next_point(position, direction))
-
-    def push_box(self, position: QPoint, direction: Direction) -> QPoint:
-        assert self.is_box(position), "Not a box"
-
-        next_position = next_point(position, direction)
-
-        self.boxes.remove(position)
-        self.boxes.append(next_position)
-
-        return next_position
-
-    def pull_box(self, current_position: QPoint, prev_position: QPoint) -> None:
-        assert self.is_box(current_position), "Not a box"
-
-        self.boxes.remove(current_position)
-        self.boxes.append(prev_position)
+    def is_goal(self, position: (int, int)) -> bool:
+        return self._start.is_goal(self._start.index(*position))
 
-    def is_level_completed(self):
-        for box in self.boxes:
-            if not box in self.goals:
-                return False
-        return True
+    def is_dead(self, position: (int, int)) -> bool:
+        """ A box on a dead square can never reach a goal """
+        return self.tables.is_dead(self._start.index(*position))
 
     def is_inside(self, column, row):
-        return QPoint(column, row) in self.reachables
-
-    def _build_reachables(self):
-        self.reachables = []
-
-        self._visit(self.player_start)
-
-    def _visit(self, point: QPoint):
-        if point in self.reachables:
-            return
-        elif self.is_wall(point):
-            return
-        else:
-            self.reachables.append(point)
-            for neighbour in self._neighbours(point):
-                self._visit(neighbour)
-
-    def _neighbours(self, point):
-        neighbours = []
-        if point.x() > 0:
-            neighbours.append(next_point(point, Direction.LEFT))
-        if point.x() < self.columns - 1:
-            neighbours.append(next_point(point, Direction.RIGHT))
-        if point.y() > 0:
-            neighbours.append(next_point(point, Direction.UP))
-        if point.y() < self.rows - 1:
-            neighbours.append(next_point(point, Direction.DOWN))
-        return neighbours
+        return self._start.is_floor(self._start.index(column, row))
 
 
 @overload
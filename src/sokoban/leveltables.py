@@ -0,0 +1,109 @@
+"""
+    Static tables of a level, computed once when the level is loaded. They only depend on the walls
+    and the goals, so they hold for every position of the game.
+
+    Cells are the indexes of sokoban.gamestate (row * stride + column), k is the index of a goal
+    in goal_cells. Tables are bitsets or compact arrays:
+
+      - distances: the number of pushes to bring a box from a cell to each goal, alone in the level,
+        an unsigned short array of cells x goals (UNREACHABLE when it's not possible);
+      - dead: the dead squares, floor cells from which a box can never reach a goal;
+      - tunnels: floor cells between two walls (horizontally or vertically), a corridor one cell wide;
+      - areas: the decomposition of the floor into rooms and tunnels, the connected components
+        of the non tunnel cells and of the tunnel cells. areas[cell] is the number of the area
+        of a cell (0 outside the floor), area_kinds[number] is ROOM or TUNNEL.
+"""
+from array import array
+
+from sokoban.gamestate import GameState
+
+UNREACHABLE = 0xffff
+
+ROOM = 1
+TUNNEL = 2
+
+
+class LevelTables:
+
+    def __init__(self, state: GameState):
+        self.stride = state.stride
+        self.cells = state.rows * state.stride
+        self.goal_cells = array('H', (i for i in range(self.cells) if state.is_goal(i)))
+        self.floor = state.floor
+
+        self.distances = self._push_distances()
+        goals = len(self.goal_cells)
+        self.dead = 0
+        for cell in self._floor_cells():
+            if min(self.distances[cell * goals:(cell + 1) * goals], default=UNREACHABLE) == UNREACHABLE:
+                self.dead |= 1 << cell
+
+        self.tunnels = 0
+        for cell in self._floor_cells():
+            if (state.is_wall(cell - 1) and state.is_wall(cell + 1)
+                    or state.is_wall(cell - self.stride) and state.is_wall(cell + self.stride)):
+                self.tunnels |= 1 << cell
+        self.areas, self.area_kinds = self._decompose()
+
+    def _floor_cells(self):
+        return (i for i in range(self.cells) if self.floor >> i & 1)
+
+    def _push_distances(self) -> array:
+        """ Pull a box away from every goal, breadth first: a pull is a push in reverse """
+        goals = len(self.goal_cells)
+        distances = array('H', [UNREACHABLE]) * (self.cells * goals)
+        offsets = (-1, 1, -self.stride, self.stride)
+        for k, goal in enumerate(self.goal_cells):
+            distances[goal * goals + k] = 0
+            frontier = [goal]
+            pulls = 0
+            while frontier:
+                pulls += 1
+                reached = []
+                for cell in frontier:
+                    for offset in offsets:
+                        # The box goes to cell + offset, the player pulling it stands beyond it
+                        box = cell + offset
+                        player = box + offset
+                        if (0 <= player < self.cells and self.floor >> box & 1 and self.floor >> player & 1
+                                and distances[box * goals + k] == UNREACHABLE):
+                            distances[box * goals + k] = pulls
+                            reached.append(box)
+                frontier = reached
+        return distances
+
+    def _decompose(self) -> (array, bytearray):
+        areas = array('H', [0]) * self.cells
+        kinds = bytearray(1)
+        for cell in self._floor_cells():
+            if areas[cell]:
+                continue
+            number = len(kinds)
+            tunnel = self.tunnels >> cell & 1
+            kinds.append(TUNNEL if tunnel else ROOM)
+            # Flood the cells of the same kind
+            areas[cell] = number
+            frontier = [cell]
+            while frontier:
+                i = frontier.pop()
+                for neighbor in (i - 1, i + 1, i - self.stride, i + self.stride):
+                    if (self.floor >> neighbor & 1 and not areas[neighbor]
+                            and self.tunnels >> neighbor & 1 == tunnel):
+                        areas[neighbor] = number
+                        frontier.append(neighbor)
+        return areas, kinds
+
+    def distance(self, cell: int, k: int) -> int:
+        """ Pushes to bring a box from cell to the k-th goal, UNREACHABLE if it's not possible """
+        return self.distances[cell * len(self.goal_cells) + k]
+
+    def goal_distances(self, cell: int) -> array:
+        """ The push distances from cell to every goal """
+        goals = len(self.goal_cells)
+        return self.distances[cell * goals:(cell + 1) * goals]
+
+    def is_dead(self, cell: int) -> bool:
+        return self.dead >> cell & 1 == 1
+
+    def is_tunnel(self, cell: int) -> bool:
+        return self.tunnels >> cell & 1 == 1
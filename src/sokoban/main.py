@@ -1,4 +1,3 @@
-from dataclasses import dataclass
 import math
 import sys
 
@@ -8,8 +7,10 @@ from PySide6.QtGui import QIcon, QPainter, QColor, QPen, QPixmap, QBrush, \
 from PySide6.QtWidgets import QApplication, QMainWindow, QGraphicsLineItem, QGraphicsRectItem, \
     QMessageBox
 
-from sokoban import CELL_SIZE, Direction, next_point
+from sokoban import CELL_SIZE, Direction
 from sokoban.chooseleveldialog import ChooseLevelDialog
+from sokoban.engine import Game
+from sokoban.gamestate import DIRECTIONS
 from sokoban.levels import get_level, get_levels_count, get_sets
 from sokoban.qgraphicsgrid import QGraphicsGridScene, QGraphicsGridView, QGraphicsGridPixmapItem, \
     QAutoCenterWidget, BoxItem, QGraphicsGridRectItem, PlayerItem
@@ -34,21 +35,11 @@ COLOR_GRAY = QColor("#333333")
 COLOR_FLOOR = Qt.GlobalColor.darkGray
 
 
-@dataclass
-class Move:
-    """Class for keeping track of player moves."""
-    prev_player_pos: QPoint
-    prev_box_pos: QPoint
-    current_box_pos: QPoint
-
-    def __init__(self, prev_player_pos: QPoint) -> None:
-        self.prev_player_pos = prev_player_pos
-        self.prev_box_pos = None
-        self.current_box_pos = None
-
-
-# TODO: A better separation of game logic and game drawing
 class MainWindow(QMainWindow):
+    """
+        The view of a sokoban.engine.Game: the rules are all in the Game,
+        the window forwards the keys and moves the items as the Game reports.
+    """
 
     def __init__(self):
         super().__init__()
@@ -79,8 +70,8 @@ class MainWindow(QMainWindow):
 
         self.player = None
         self.level = None
+        self.game = None
         self.box_items = []
-        self.history = []
 
         settings = QSettings()
         self.current_set = settings.value('level/set', get_sets()[0], str)
@@ -95,7 +86,6 @@ class MainWindow(QMainWindow):
 
     def _new_level(self):
         self.scene.clear()
-        self.history = []
 
         if self.current_level >= get_levels_count(self.current_set):
             self._show_setcompleted_dialog()
@@ -103,6 +93,7 @@ class MainWindow(QMainWindow):
             return
 
         self.level = get_level(self.current_set, self.current_level)
+        self.game = Game(self.level)
         self.scene.setGridDimensions(self.level.columns, self.level.rows)
 
         if DRAW_GRID:
@@ -163,9 +154,9 @@ class MainWindow(QMainWindow):
         self.box_items = []
         for box_pos in self.level.boxes_start:
             box = BoxItem()
-            box.setGridPos(box_pos)
+            box.setGridPos(QPoint(*box_pos))
             box.setZValue(2)
-            box.setOnTarget(self.level.is_box_on_target(box_pos))
+            box.setOnTarget(self.level.is_goal(box_pos))
             self.box_items.append(box)
             self.scene.addItem(box)
 
@@ -174,14 +165,14 @@ class MainWindow(QMainWindow):
         goal_pixmap = QPixmap(":/images/goal.svg").scaled(CELL_SIZE, CELL_SIZE)
         for goal_pos in self.level.goals:
             goal = QGraphicsGridPixmapItem(goal_pixmap)
-            goal.setGridPos(goal_pos)
+            goal.setGridPos(QPoint(*goal_pos))
             goal.setZValue(1)
             self.scene.addItem(goal)
 
     def _draw_player(self):
         """Draw the player"""
         self.player = PlayerItem()
-        self.player.setGridPos(self.level.player_start)
+        self.player.setGridPos(QPoint(*self.level.player_start))
         self.player.setZValue(100)
         self.scene.addItem(self.player)
 
@@ -189,7 +180,7 @@ class MainWindow(QMainWindow):
         """Center the view on the player if the size of the level
             is bigger than the size of the view, on the view otherwise"""
         if self.level.columns > self.view.gridWidth():
-            x1 = self.level.player_start.x() - int(self.view.gridWidth() / 2)
+            x1 = self.level.player_start[0] - int(self.view.gridWidth() / 2)
             x1 = max(0, x1)
             delta_x = x1 + self.view.gridWidth() - self.level.columns
             x1 = min(x1, x1 - delta_x)
@@ -199,7 +190,7 @@ class MainWindow(QMainWindow):
             self.view.setXOffset(-frac)
             self.view.setGridX1(-int(whole))
         if self.level.rows > self.view.gridHeight():
-            y1 = self.level.player_start.y() - int(self.view.gridHeight() / 2)
+            y1 = self.level.player_start[1] - int(self.view.gridHeight() / 2)
             y1 = max(0, y1)
             delta_y = y1 + self.view.gridHeight() - self.level.rows
             y1 = min(y1, y1 - delta_y)
@@ -254,6 +245,8 @@ class MainWindow(QMainWindow):
             self._restart_level()
         elif key == Qt.Key_U:
             self._undo()
+        elif key == Qt.Key_Y:
+            self._redo()
         elif key == Qt.Key_N:
             if self.current_level < get_levels_count(self.current_set) - 1:
                 self.current_level += 1
@@ -266,47 +259,44 @@ class MainWindow(QMainWindow):
             self.show_choose_level_dialog()
 
     def _move_player(self, direction):
-
-        # Here I don't check the level boundaries,
-        # but every valid level is completely closed by walls
-        next_position = next_point(self.player.gridPos(), direction)
-        move = Move(self.player.gridPos())
-
-        if self.level.is_wall(next_position):
+        step = self.game.move(direction)
+        if step is None:
             return
-        if self.level.is_box(next_position):
-            if self.level.can_push(next_position, direction):
-                next_box_position = self.level.push_box(next_position, direction)
-                box = self.box_at(next_position)
-                box.setGridPos(next_box_position)
-                box.setOnTarget(self.level.is_box_on_target(next_box_position))
-                move.prev_box_pos = next_position
-                move.current_box_pos = next_box_position
-            else:
-                return
-
-        self.history.append(move)
 
-        self._shift_view(direction, next_position)
+        self._shift_view(direction, QPoint(*step.player_to))
+        self._show_step(step)
+        self._check_completed()
 
-        self.player.setGridPos(next_position)
-
-        if self.level.is_level_completed():
+    def _check_completed(self):
+        if self.game.is_completed():
             print("Level completed.")
             if self.current_level + 1 == get_levels_count(self.current_set):
                 self._show_setcompleted_dialog()
             else:
                 self._show_nextlevel_dialog()
 
+    def _show_step(self, step):
+        if step.box_from:
+            box = self.box_at(QPoint(*step.box_from))
+            box.setGridPos(QPoint(*step.box_to))
+            box.setOnTarget(self.game.is_goal(step.box_to))
+        self.player.setGridPos(QPoint(*step.player_to))
+
     def _undo(self):
-        if self.history:
-            move = self.history.pop()
-            self.player.setGridPos(move.prev_player_pos, True)
-            if move.current_box_pos:
-                box = self.box_at(move.current_box_pos)
-                self.level.pull_box(move.current_box_pos, move.prev_box_pos)
-                box.setGridPos(move.prev_box_pos)
-                box.setOnTarget(self.level.is_box_on_target(move.prev_box_pos))
+        step = self.game.undo()
+        if step:
+            self.player.setGridPos(QPoint(*step.player_from), True)
+            if step.box_to:
+                box = self.box_at(QPoint(*step.box_to))
+                box.setGridPos(QPoint(*step.box_from))
+                box.setOnTarget(self.game.is_goal(step.box_from))
+
+    def _redo(self):
+        step = self.game.redo()
+        if step:
+            self._shift_view(DIRECTIONS[step.char.lower()], QPoint(*step.player_to))
+            self._show_step(step)
+            self._check_completed()
 
     def _show_nextlevel_dialog(self):
         button = QMessageBox.information(
@@ -0,0 +1,493 @@
+"""
+    Push optimal Sokoban solver, it does not depend on Qt.
+
+    The search is over pushes: a node is the position of the boxes and the area the player can reach,
+    the cost of a node is the number of pushes. A* (or IDA*, with less memory) is guided by
+    the minimum matching lower bound: the cheapest assignment of boxes to goals,
+    with the push distances of a single box on the empty level as costs.
+
+    Positions that can't lead to a solution are pruned:
+      - simple deadlocks: a box on a dead square, a cell from which no goal can be reached by pushes,
+        precomputed by pulling a box away from every goal;
+      - freeze deadlocks: a box that can't move any more, neither horizontally nor vertically,
+        because of walls, dead squares or other frozen boxes, and that is not on a goal;
+      - positions where the boxes can't be matched to distinct goals (infinite lower bound).
+    Positions already seen with fewer pushes are cut by a transposition table keyed
+    by a Zobrist hash of the boxes and of the (normalized) player position.
+
+        result = Solver(get_level('Microban', 0)).solve()
+        result.solution, result.pushes, result.nodes_per_second
+
+    From the command line, every level of a set solved in a pool of processes:
+
+        python -m sokoban.solver --set Microban --jobs 8 --timeout 30 [--output solutions.jsonl]
+
+    The timeout is wall-clock time per level: with more jobs than CPUs the levels share the CPUs
+    and are searched less in the same time.
+
+    A JSON object per level is appended to the output as soon as the level is done
+    (set, level, index, solution, pushes, moves, nodes, time, timed_out).
+    Running the command again resumes: the levels already in the output are skipped,
+    except the ones that timed out, which are tried again (the last line of a level wins).
+"""
+import argparse
+import heapq
+import json
+from multiprocessing import Pool
+import os
+import random
+import re
+import sys
+import time
+from typing import NamedTuple
+
+from sokoban import Direction
+from sokoban.gamestate import LURD, GameState
+from sokoban.levels import Level, get_level, _SETS
+from sokoban.leveltables import UNREACHABLE
+
+# Push distance from a cell that can't reach a goal, large enough to stay above any sum of distances
+_UNREACHABLE = 1 << 20
+
+
+class SolverResult(NamedTuple):
+    solution: str  # moves in LURD notation, None if the level was not solved
+    pushes: int
+    moves: int
+    nodes: int  # number of positions expanded
+    elapsed: float  # wall-clock time in seconds
+    timed_out: bool = False
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class _Timeout(Exception):
+    pass
+
+
+def _min_matching(costs: list, goals: int) -> int:  # pylint: disable=too-many-locals
+    """
+        Cost of the minimum assignment of every row of costs to a distinct column (Hungarian algorithm),
+        len(costs) <= goals. The result is >= _UNREACHABLE when there is no assignment with finite costs.
+    """
+    u = [0] * (len(costs) + 1)
+    v = [0] * (goals + 1)
+    assigned = [0] * (goals + 1)  # assigned[column] is the row (1 based) matched to the column
+    way = [0] * (goals + 1)
+    for row in range(1, len(costs) + 1):
+        assigned[0] = row
+        column = 0
+        min_v = [float('inf')] * (goals + 1)
+        used = [False] * (goals + 1)
+        while True:
+            used[column] = True
+            row0 = assigned[column]
+            row_costs = costs[row0 - 1]
+            u_row0 = u[row0]
+            delta = float('inf')
+            next_column = 0
+            for j in range(1, goals + 1):
+                if not used[j]:
+                    cur = row_costs[j - 1] - u_row0 - v[j]
+                    if cur < min_v[j]:
+                        min_v[j] = cur
+                        way[j] = column
+                    if min_v[j] < delta:
+                        delta = min_v[j]
+                        next_column = j
+            for j in range(goals + 1):
+                if used[j]:
+                    u[assigned[j]] += delta
+                    v[j] -= delta
+                else:
+                    min_v[j] -= delta
+            column = next_column
+            if assigned[column] == 0:
+                break
+        while column:
+            previous = way[column]
+            assigned[column] = assigned[previous]
+            column = previous
+    return -v[0]
+
+
+class Solver:
+    """
+        Works on the static tables of the level (dead squares and push distances, see sokoban.leveltables),
+        solve() searches from the start of the level or from any GameState of it.
+    """
+
+    def __init__(self, level: Level):
+        self.level = level
+        start = level.new_state()
+        self.stride = start.stride
+        self.walls = start.walls
+        self.goals = start.goals
+        tables = level.tables
+        self._goal_cells = list(tables.goal_cells)
+        self._offsets = [(start.offsets[direction], LURD[direction].upper()) for direction in Direction]
+        self._push_offsets = {char: offset for offset, char in self._offsets}
+
+        # distances[cell][k] is the number of pushes to bring a box from cell to the k-th goal
+        self.distances = [[_UNREACHABLE if distance == UNREACHABLE else distance
+                           for distance in tables.goal_distances(cell)] for cell in range(tables.cells)]
+        self.dead = tables.dead
+        self.live = start.floor & ~self.dead
+        # (distance, goal) of the nearest goal of every cell
+        self._nearest = [min((distance, k) for k, distance in enumerate(row)) if row else (_UNREACHABLE, -1)
+                         for row in self.distances]
+
+        rnd = random.Random(len(self.distances))
+        self._box_keys = [rnd.getrandbits(64) for _ in self.distances]
+        self._player_keys = [rnd.getrandbits(64) for _ in self.distances]
+        self._bounds = {}
+
+    def _reach(self, player: int, boxes: int) -> int:
+        """ The cells the player can walk to without pushing, as a bitset """
+        free = ~(self.walls | boxes)
+        stride = self.stride
+        reached = 1 << player
+        while True:
+            grown = (reached | reached << 1 | reached >> 1 | reached << stride | reached >> stride) & free
+            if grown == reached:
+                return reached
+            reached = grown
+
+    def lower_bound(self, boxes: int) -> int:
+        """ Minimum matching of the boxes to the goals, >= _UNREACHABLE if they can't all reach a goal """
+        bound = self._bounds.get(boxes)
+        if bound is None:
+            cells = []
+            scan = boxes
+            while scan:
+                low = scan & -scan
+                cells.append(low.bit_length() - 1)
+                scan ^= low
+            nearest = [self._nearest[cell] for cell in cells]
+            if len(cells) > len(self._goal_cells):
+                bound = _UNREACHABLE
+            elif len({k for _distance, k in nearest}) == len(cells):
+                # Every box has its own nearest goal: that's already the minimum matching
+                bound = sum(distance for distance, _k in nearest)
+            else:
+                bound = _min_matching([self.distances[cell] for cell in cells], len(self._goal_cells))
+            self._bounds[boxes] = bound
+        return bound
+
+    def _frozen(self, cell: int, boxes: int, blocked: int, group: list) -> bool:
+        """
+            True if the box on cell can't move along either axis. blocked are the cells already
+            taken as immovable (walls and the boxes being checked), group collects the frozen boxes.
+        """
+        blocked |= 1 << cell
+        for offset in (1, self.stride):
+            before = cell - offset
+            after = cell + offset
+            if blocked >> before & 1 or blocked >> after & 1:
+                continue
+            if self.dead >> before & 1 and self.dead >> after & 1:
+                continue
+            if boxes >> before & 1 and self._frozen(before, boxes, blocked, group):
+                continue
+            if boxes >> after & 1 and self._frozen(after, boxes, blocked, group):
+                continue
+            return False
+        group.append(cell)
+        return True
+
+    def is_freeze_deadlock(self, cell: int, boxes: int) -> bool:
+        """ The box pushed to cell is frozen together with a box that is not on a goal """
+        group = []
+        if not self._frozen(cell, boxes, self.walls, group):
+            return False
+        return any(not self.goals >> box & 1 for box in group)
+
+    def _pushes(self, boxes: int, reach: int):
+        """ Yield (box, target, char) for every push that doesn't end in a deadlock """
+        obstacles = self.walls | boxes
+        scan = boxes
+        while scan:
+            low = scan & -scan
+            box = low.bit_length() - 1
+            scan ^= low
+            for offset, char in self._offsets:
+                target = box + offset
+                if not reach >> (box - offset) & 1 or obstacles >> target & 1 or not self.live >> target & 1:
+                    continue
+                if self.is_freeze_deadlock(target, boxes ^ (low | 1 << target)):
+                    continue
+                yield box, target, char
+
+    def _hash(self, boxes: int) -> int:
+        key = 0
+        while boxes:
+            low = boxes & -boxes
+            key ^= self._box_keys[low.bit_length() - 1]
+            boxes ^= low
+        return key
+
+    def solve(self, state: GameState = None, method='astar', timeout=None) -> SolverResult:
+        """
+            Search a solution with the fewest pushes from state (the start of the level by default).
+            method is 'astar' or 'idastar'; the search gives up after timeout seconds.
+        """
+        if method not in ('astar', 'idastar'):
+            raise ValueError(f'Unknown method: {method}')
+        if state is None:
+            state = self.level.new_state()
+        deadline = None if timeout is None else time.perf_counter() + timeout
+
+        begin = time.perf_counter()
+        search = self._astar if method == 'astar' else self._idastar
+        try:
+            pushes, nodes = search(state.player, state.boxes, deadline)
+            timed_out = False
+        except _Timeout as e:
+            pushes, nodes = None, e.args[0]
+            timed_out = True
+        elapsed = time.perf_counter() - begin
+
+        if pushes is None:
+            return SolverResult(None, 0, 0, nodes, elapsed, timed_out)
+        solution = self._moves(state, pushes)
+        return SolverResult(solution, len(pushes), len(solution), nodes, elapsed)
+
+    def _astar(self, player: int, boxes: int, deadline) -> (list, int):  # pylint: disable=too-many-locals
+        bound = self.lower_bound(boxes)
+        if bound >= _UNREACHABLE:
+            return None, 0
+
+        seen = {}
+        nodes = 0
+        counter = 0
+        # Entries are (f, -g, counter, g, player, boxes, boxes hash, pushes):
+        # among equal f the deepest node first, pushes is a linked list (previous, box, char)
+        to_visit = [(bound, 0, 0, 0, player, boxes, self._hash(boxes), None)]
+        while to_visit:
+            _f, _, _, g, player, boxes, boxes_hash, pushes = heapq.heappop(to_visit)
+            if boxes & ~self.goals == 0:
+                return self._unlink(pushes), nodes
+
+            reach = self._reach(player, boxes)
+            # The player position is normalized to the top-left cell of its area
+            area = (reach & -reach).bit_length() - 1
+            key = boxes_hash ^ self._player_keys[area]
+            entry = seen.get(key)
+            if entry is not None and entry[0] <= g and entry[1] == boxes and entry[2] == area:
+                continue
+            seen[key] = (g, boxes, area)
+
+            nodes += 1
+            if deadline is not None and nodes & 1023 == 0 and time.perf_counter() > deadline:
+                raise _Timeout(nodes)
+
+            g += 1
+            for box, target, char in self._pushes(boxes, reach):
+                child = boxes ^ (1 << box | 1 << target)
+                h = self.lower_bound(child)
+                if h >= _UNREACHABLE:
+                    continue
+                counter += 1
+                heapq.heappush(to_visit, (g + h, -g, counter, g, box, child,
+                                          boxes_hash ^ self._box_keys[box] ^ self._box_keys[target],
+                                          (pushes, box, char)))
+        return None, nodes
+
+    def _idastar(self, player: int, boxes: int, deadline) -> (list, int):
+        threshold = self.lower_bound(boxes)
+        nodes = [0]
+        while threshold < _UNREACHABLE:
+            # The transposition table is per iteration: a position is expanded again only with fewer pushes
+            seen = {}
+            found, next_threshold = self._depth_first(player, boxes, self._hash(boxes), 0, threshold,
+                                                      seen, nodes, deadline)
+            if found is not None:
+                found.reverse()
+                return found, nodes[0]
+            threshold = next_threshold
+        return None, nodes[0]
+
+    # pylint: disable-next=too-many-arguments,too-many-positional-arguments,too-many-locals
+    def _depth_first(self, player, boxes, boxes_hash, g, threshold, seen, nodes, deadline):
+        """ Return (pushes in reverse order or None, lowest f above the threshold) """
+        if boxes & ~self.goals == 0:
+            return [], threshold
+
+        reach = self._reach(player, boxes)
+        area = (reach & -reach).bit_length() - 1
+        key = boxes_hash ^ self._player_keys[area]
+        entry = seen.get(key)
+        if entry is not None and entry[0] <= g and entry[1] == boxes and entry[2] == area:
+            return None, _UNREACHABLE
+        seen[key] = (g, boxes, area)
+
+        nodes[0] += 1
+        if deadline is not None and nodes[0] & 1023 == 0 and time.perf_counter() > deadline:
+            raise _Timeout(nodes[0])
+
+        children = []
+        for box, target, char in self._pushes(boxes, reach):
+            child = boxes ^ (1 << box | 1 << target)
+            h = self.lower_bound(child)
+            if h < _UNREACHABLE:
+                children.append((h, box, target, char, child))
+        children.sort()
+
+        lowest = _UNREACHABLE
+        for h, box, target, char, child in children:
+            f = g + 1 + h
+            if f > threshold:
+                lowest = min(lowest, f)
+                continue
+            child_hash = boxes_hash ^ self._box_keys[box] ^ self._box_keys[target]
+            found, above = self._depth_first(box, child, child_hash, g + 1, threshold, seen, nodes, deadline)
+            if found is not None:
+                found.append((box, char))
+                return found, threshold
+            lowest = min(lowest, above)
+        return None, lowest
+
+    @staticmethod
+    def _unlink(pushes) -> list:
+        result = []
+        while pushes is not None:
+            pushes, box, char = pushes
+            result.append((box, char))
+        result.reverse()
+        return result
+
+    def _moves(self, state: GameState, pushes: list) -> str:
+        """ The LURD moves of a sequence of (box, push char): walk to each box, then push it """
+        player = state.player
+        boxes = state.boxes
+        moves = []
+        for box, char in pushes:
+            offset = self._push_offsets[char]
+            moves.append(self._walk(player, box - offset, boxes))
+            moves.append(char)
+            boxes ^= 1 << box | 1 << (box + offset)
+            player = box
+        return ''.join(moves)
+
+    def _walk(self, start: int, end: int, boxes: int) -> str:
+        """ Shortest walk of the player from start to end, without pushing """
+        obstacles = self.walls | boxes
+        parents = {start: None}
+        frontier = [start]
+        while end not in parents:
+            reached = []
+            for cell in frontier:
+                for offset, char in self._offsets:
+                    neighbor = cell + offset
+                    if neighbor not in parents and not obstacles >> neighbor & 1:
+                        parents[neighbor] = (cell, char.lower())
+                        reached.append(neighbor)
+            frontier = reached
+        walk = []
+        cell = end
+        while parents[cell] is not None:
+            cell, char = parents[cell]
+            walk.append(char)
+        walk.reverse()
+        return ''.join(walk)
+
+
+def solve(level: Level, method='astar', timeout=None) -> SolverResult:
+    return Solver(level).solve(method=method, timeout=timeout)
+
+
+def _solve_task(task) -> dict:
+    setname, index, levelname, method, timeout = task
+    result = solve(get_level(setname, levelname), method, timeout)
+    return {'set': setname, 'level': levelname, 'index': index, 'solution': result.solution,
+            'pushes': result.pushes, 'moves': result.moves, 'nodes': result.nodes,
+            'time': round(result.elapsed, 3), 'timed_out': result.timed_out}
+
+
+def read_results(path) -> dict:
+    """ The results of a file written by the batch solver, by level name. Unreadable lines are skipped """
+    results = {}
+    if not os.path.exists(path):
+        return results
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+                results[result['level']] = result
+            except (ValueError, KeyError, TypeError):
+                # A line cut short by an interrupted run
+                continue
+    return results
+
+
+def _results(tasks, jobs):
+    if jobs > 1:
+        with Pool(jobs) as pool:
+            yield from pool.imap_unordered(_solve_task, tasks)
+    else:
+        yield from map(_solve_task, tasks)
+
+
+def _parse_cmdline(argv):
+    parser = argparse.ArgumentParser(prog='python -m sokoban.solver',
+                                     description='solve every level of a set')
+    parser.add_argument('--set', dest='setname', choices=_SETS.keys(), required=True, help='level set')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(),
+                        help='number of worker processes (default: number of CPUs), more jobs than CPUs'
+                             ' share them and get less search in the same timeout')
+    parser.add_argument('--timeout', type=float, default=30,
+                        help='wall-clock seconds per level, not CPU time (default: 30)')
+    parser.add_argument('--method', choices=['astar', 'idastar'], default='astar',
+                        help='search algorithm (default: astar)')
+    parser.add_argument('--output',
+                        help='JSON lines file, resumed if it exists (default: solutions-SET.jsonl)')
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error(f'argument --jobs: invalid number {args.jobs}, expected at least 1')
+    if args.timeout <= 0:
+        parser.error(f'argument --timeout: invalid value {args.timeout}, expected a positive number')
+    return args
+
+
+def batch(args):
+    output = args.output or 'solutions-' + re.sub(r'\W+', '-', args.setname.lower()) + '.jsonl'
+    done = read_results(output)
+    tasks = [(args.setname, index, levelname, args.method, args.timeout)
+             for index, levelname in enumerate(_SETS[args.setname])
+             if levelname not in done or done[levelname].get('timed_out', False)]
+    print(f'{len(_SETS[args.setname]) - len(tasks)} levels already in {output}, {len(tasks)} to solve',
+          file=sys.stderr)
+    if args.jobs > (os.cpu_count() or 1):
+        print(f'Warning: {args.jobs} jobs on {os.cpu_count()} CPUs, the timeout is wall-clock time:'
+              f' levels get less search time than with one job per CPU', file=sys.stderr)
+
+    start = time.perf_counter()
+    solved = 0
+    nodes = 0
+    with open(output, 'a+', encoding='utf-8') as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() > 0:
+            f.seek(f.tell() - 1)
+            if f.read(1) != '\n':
+                f.write('\n')
+
+        # Results are written as they come, so an interrupted run loses only the levels in progress
+        for result in _results(tasks, args.jobs):
+            f.write(json.dumps(result) + '\n')
+            f.flush()
+            solved += result['solution'] is not None
+            nodes += result['nodes']
+    elapsed = time.perf_counter() - start
+
+    print(f'Solved {solved} of {len(tasks)} levels in {elapsed:.2f}s'
+          f' ({nodes / max(elapsed, 1e-9):.0f} nodes/s)', file=sys.stderr)
+
+
+def main(argv=None):
+    batch(_parse_cmdline(argv))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+from mazegenerator.bfslonghestpath import BfsLonghestPath
+from mazegenerator.maze import Maze
+
+MAZE_6X6 = 'Maze[6,6,5,9,5,1,3,9,12,14,12,12,7,10,4,3,10,6,1,9,12,5,3,11,12,12,12,6,9,7,10,12,6,11,6,3,3,10]'
+
+
+class TestBfsLonghestPath:
+
+    def test_longest_path(self):
+        maze = Maze.from_str(MAZE_6X6)
+        path = BfsLonghestPath(maze).run()
+
+        assert len(path) == 25
+        assert len(set(path)) == 25
+        for coord1, coord2 in zip(path, path[1:]):
+            assert coord2 in maze.visitable_neighbors(coord1)
+
+    def test_from_start(self):
+        maze = Maze.from_str(MAZE_6X6)
+        bfs = BfsLonghestPath(maze)
+        path = bfs.run(start=(0, 0), absolute_longhest=False)
+
+        assert path[-1] == (0, 0)
+        assert len(path) == max(bfs.distance) + 1
+        assert not any(cell.is_visited() for cell in maze)
+
+    def test_single_cell(self):
+        assert BfsLonghestPath(Maze(1, 1)).run() == [(0, 0)]
@@ -0,0 +1,70 @@
+import pytest
+
+from mazegenerator import cli
+from mazegenerator.maze import Maze
+
+
+class TestCli:
+
+    def test_generate(self, tmp_path):
+        output = tmp_path / 'mazes.txt'
+        cli.main(['generate', '--algorithm', 'kruskal', '--size', '7x5', '--count', '3',
+                  '--seed', '42', '--jobs', '1', '--output', str(output)])
+
+        lines = output.read_text().splitlines()
+        assert len(lines) == 3
+        for line in lines:
+            maze = Maze.from_str(line)
+            assert (maze.columns, maze.rows) == (7, 5)
+
+        # Same seed, same mazes, also when generated by a pool of processes
+        output2 = tmp_path / 'mazes2.txt'
+        cli.main(['generate', '--algorithm', 'kruskal', '--size', '7x5', '--count', '3',
+                  '--seed', '42', '--jobs', '2', '--output', str(output2)])
+        assert output2.read_text() == output.read_text()
+
+    @pytest.mark.parametrize('option', [['--count', '-3'], ['--count', 'x'],
+                                        ['--jobs', '0'], ['--jobs', '-2']])
+    def test_generate_invalid_options(self, tmp_path, option):
+        output = tmp_path / 'mazes.txt'
+        with pytest.raises(SystemExit):
+            cli.main(['generate', '--size', '4x3', *option, '--output', str(output)])
+        assert not output.exists()
+
+    @pytest.mark.parametrize('size', [['--columns', '0', '--rows', '3'], ['--columns', '-2'],
+                                      ['--columns', '4', '--rows', '0'], ['--columns', 'x']])
+    def test_stream_invalid_size(self, tmp_path, size):
+        output = tmp_path / 'maze.map'
+        with pytest.raises(SystemExit):
+            cli.main(['stream', *size, '--output', str(output)])
+        assert not output.exists()
+
+    @pytest.mark.parametrize('jobs', ['0', '-1', 'x'])
+    def test_diameter_invalid_jobs(self, tmp_path, jobs):
+        mazes = tmp_path / 'mazes.txt'
+        cli.main(['generate', '--size', '4x3', '--count', '2', '--jobs', '1', '--output', str(mazes)])
+        with pytest.raises(SystemExit):
+            cli.main(['diameter', str(mazes), '--jobs', jobs])
+
+    def test_export(self, tmp_path):
+        mazes = tmp_path / 'mazes.bin'
+        cli.main(['generate', '--size', '6x4', '--count', '2', '--seed', '1',
+                  '--jobs', '1', '--format', 'binary', '--output', str(mazes)])
+
+        image = tmp_path / 'maze.png'
+        cli.main(['export', str(mazes), str(image), '--index', '1', '--scale', '2', '--path'])
+        assert image.read_bytes().startswith(b'\x89PNG')
+
+        image = tmp_path / 'maze.pbm'
+        cli.main(['export', str(mazes), str(image)])
+        assert image.read_bytes().startswith(b'P4\n13 9\n')
+
+    @pytest.mark.parametrize('scale', ['0', '-2', 'x'])
+    def test_export_invalid_scale(self, tmp_path, scale):
+        mazes = tmp_path / 'mazes.bin'
+        cli.main(['generate', '--size', '6x4', '--seed', '1', '--format', 'binary', '--output', str(mazes)])
+
+        image = tmp_path / 'maze.png'
+        with pytest.raises(SystemExit):
+            cli.main(['export', str(mazes), str(image), '--scale', scale])
+        assert not image.exists()
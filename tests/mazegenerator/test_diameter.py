@@ -0,0 +1,43 @@
+import pytest
+
+from mazegenerator.bfslonghestpath import BfsLonghestPath
+from mazegenerator.cli import generate_maze
+from mazegenerator.diameter import MazeDiameter, batch_diameters, maze_diameter
+from mazegenerator.maze import Maze
+
+
+class TestDiameter:
+
+    @pytest.mark.parametrize('algorithm', ['depthfirst', 'breadthfirst', 'kruskal', 'eller'])
+    def test_maze_diameter(self, algorithm):
+        maze = generate_maze(algorithm, 15, 11, seed=5)
+        path, length = maze_diameter(maze)
+
+        assert length == len(path) - 1
+        assert length == len(BfsLonghestPath(maze).run()) - 1
+        for coord1, coord2 in zip(path, path[1:]):
+            assert coord2 in maze.visitable_neighbors(coord1)
+
+    def test_reuse(self):
+        diameter = MazeDiameter()
+        small = generate_maze('kruskal', 4, 3, seed=1)
+        large = generate_maze('kruskal', 20, 20, seed=1)
+
+        assert diameter.run(large) == maze_diameter(large)
+        assert diameter.run(small) == maze_diameter(small)
+
+    def test_not_perfect(self):
+        maze = Maze(2, 2)
+        maze.crave_passage((0, 0), (1, 0))
+        maze.crave_passage((1, 0), (1, 1))
+        maze.crave_passage((1, 1), (0, 1))
+        maze.crave_passage((0, 1), (0, 0))
+
+        with pytest.raises(ValueError):
+            maze_diameter(maze)
+
+    def test_batch_diameters(self):
+        mazes = [generate_maze('depthfirst', 8, 6, seed=seed) for seed in range(5)]
+
+        lengths = list(batch_diameters(mazes, jobs=2))
+        assert lengths == [maze_diameter(maze)[1] for maze in mazes]
@@ -0,0 +1,16 @@
+from mazegenerator.disjointset import DisjointSet
+
+
+class TestDisjointSet:
+
+    def test_union_find(self):
+        sets = DisjointSet(6)
+
+        assert sets.union(0, 1)
+        assert sets.union(2, 3)
+        assert sets.union(1, 3)
+        assert not sets.union(0, 2)
+
+        assert sets.find(0) == sets.find(3)
+        assert sets.find(4) != sets.find(0)
+        assert sets.find(5) == 5
@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from mazegenerator.cli import generate_maze
+from mazegenerator.distanceindex import MazeDistanceIndex
+from mazegenerator.maze import Maze
+from mazegenerator.solvers.bidirectionalbfs import BidirectionalBfs
+
+
+class TestMazeDistanceIndex:
+
+    @pytest.mark.parametrize('algorithm', ['depthfirst', 'breadthfirst', 'kruskal', 'eller'])
+    def test_distance_and_path(self, algorithm):
+        maze = generate_maze(algorithm, 23, 17, seed=4)
+        index = MazeDistanceIndex(maze)
+        solver = BidirectionalBfs(maze)
+
+        rng = random.Random(0)
+        for _ in range(200):
+            a = (rng.randrange(maze.columns), rng.randrange(maze.rows))
+            b = (rng.randrange(maze.columns), rng.randrange(maze.rows))
+            expected = solver.solve(a, b).path
+
+            assert index.distance(a, b) == len(expected) - 1
+            assert index.path(a, b) == expected
+
+    def test_lca(self):
+        maze = Maze(3, 1)
+        maze.crave_passage((0, 0), (1, 0))
+        maze.crave_passage((1, 0), (2, 0))
+        index = MazeDistanceIndex(maze, root=(1, 0))
+
+        assert index.lca((0, 0), (2, 0)) == (1, 0)
+        assert index.lca((0, 0), (0, 0)) == (0, 0)
+        assert index.distance((0, 0), (2, 0)) == 2
+
+    def test_not_perfect(self):
+        with pytest.raises(ValueError):
+            MazeDistanceIndex(Maze(2, 2))
+
+        maze = Maze(2, 2)
+        for coord1, coord2 in [((0, 0), (1, 0)), ((1, 0), (1, 1)), ((1, 1), (0, 1)), ((0, 1), (0, 0))]:
+            maze.crave_passage(coord1, coord2)
+        with pytest.raises(ValueError):
+            MazeDistanceIndex(maze)
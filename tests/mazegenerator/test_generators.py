@@ -0,0 +1,145 @@
+import io
+import itertools
+import random
+import threading
+import time
+
+import pytest
+
+from mazegenerator import mazefile
+from mazegenerator.generator.abstractgenerator import BatchObserver, GeneratorObserver, VISITING, VISITED
+from mazegenerator.generator.eller import Eller
+from mazegenerator.generator.randomizedbreadthfirst import RandomizedBreadthFirst
+from mazegenerator.generator.randomizeddepthfirst import RandomizedDepthFirst
+from mazegenerator.generator.randomizedkruskal import RandomizedKruskal
+from mazegenerator.maze import Maze, MappedMaze
+
+GENERATORS = [RandomizedDepthFirst, RandomizedBreadthFirst, RandomizedKruskal, Eller]
+
+
+def is_perfect(maze: Maze) -> bool:
+    """ A perfect maze is a spanning tree: connected and with exactly cells - 1 passages """
+    passages = sum(bin(15 ^ walls).count('1') for walls in maze.walls) // 2
+    if passages != len(maze) - 1:
+        return False
+
+    reached = {(0, 0)}
+    to_visit = [(0, 0)]
+    while to_visit:
+        for neighbor in maze.visitable_neighbors(to_visit.pop()):
+            if neighbor not in reached:
+                reached.add(neighbor)
+                to_visit.append(neighbor)
+    return len(reached) == len(maze)
+
+
+class TestGenerators:
+
+    @pytest.mark.parametrize('generator', GENERATORS)
+    def test_batch_run(self, generator):
+        maze = Maze(12, 9)
+
+        assert generator(maze).run()
+        assert is_perfect(maze)
+
+    @pytest.mark.parametrize('generator', GENERATORS)
+    def test_observer(self, generator):
+        maze = Maze(5, 4)
+        visited = set()
+
+        assert generator(maze).run(0, GeneratorObserver(visited=visited.add))
+        assert is_perfect(maze)
+        assert len(visited) == len(maze)
+
+    @pytest.mark.parametrize('generator', GENERATORS)
+    def test_batch_observer(self, generator):
+        maze = Maze(5, 4)
+        batches = []
+
+        observer = BatchObserver(batches.append, interval=0)
+        assert generator(maze).run(0, observer)
+        observer.flush()
+        visited = [coord for batch in batches for status, coord in batch if status == VISITED]
+        assert len(set(visited)) == len(maze)
+
+        batches.clear()
+        observer = BatchObserver(batches.append, interval=3600)
+        generator(Maze(5, 4)).run(0, observer)
+        assert not batches
+        observer.flush()
+        assert len(batches) == 1
+
+    @pytest.mark.parametrize('generator', GENERATORS)
+    def test_batch_observer_sleep(self, generator, monkeypatch):
+        batches = []
+        observer = BatchObserver(batches.append, interval=3600)
+        last_before_sleep = []
+        monkeypatch.setattr(time, 'sleep', lambda _seconds: last_before_sleep.append(batches[-1][-1]))
+
+        assert generator(Maze(5, 4)).run(0.2, observer)
+        # The step announced before each sleep was delivered before sleeping, not after
+        assert last_before_sleep
+        for status, _coord in last_before_sleep:
+            assert status in (VISITING, VISITED)
+        assert sum(len(batch) for batch in batches) > 0
+
+    def test_batch_observer_pause(self):
+        batches = []
+        generator = RandomizedDepthFirst(Maze(5, 4))
+
+        class PausingObserver(BatchObserver):
+            """ Pauses the generator for a moment at the third visited cell """
+            count = 0
+
+            def visited(self, coord):
+                super().visited(coord)
+                self.count += 1
+                if self.count == 3:
+                    generator.pause(True)
+                    threading.Timer(0.05, generator.pause, (False,)).start()
+
+        assert generator.run(0, PausingObserver(batches.append, interval=3600))
+        # The updates pending when the generator paused are delivered without waiting for the interval
+        assert len(batches) == 1
+        assert [status for status, _coord in batches[0]].count(VISITED) == 3
+
+    @pytest.mark.parametrize('generator', GENERATORS)
+    def test_seed(self, generator):
+        maze1 = Maze(10, 8)
+        generator(maze1, start_at_random=True, rng=42).run()
+        maze2 = Maze(10, 8)
+        generator(maze2, start_at_random=True, rng=42).run()
+        maze3 = Maze(10, 8)
+        generator(maze3, start_at_random=True, rng=random.Random(42)).run()
+
+        assert maze1.seed == 42
+        assert repr(maze1) == repr(maze2)
+        assert repr(maze1) == repr(maze3)
+
+    @pytest.mark.parametrize('generator', GENERATORS)
+    def test_mapped_maze(self, generator, tmp_path):
+        with MappedMaze.create(tmp_path / 'maze.map', 12, 9) as maze:
+            assert generator(maze, rng=1).run()
+            assert is_perfect(maze)
+
+    def test_eller_stream(self):
+        maze = Maze(9, 7)
+        Eller(maze, rng=3).run()
+
+        rows = list(Eller.stream(9, 7, rng=3))
+        assert b''.join(rows) == bytes(maze.walls)
+
+        endless = Eller.stream(9, rng=3)
+        assert len(list(itertools.islice(endless, 100))) == 100
+
+    def test_eller_no_rows(self):
+        assert Eller(Maze(4, 0), rng=1).run()
+        assert not list(Eller.stream(4, 0, rng=1))
+
+    def test_eller_write_rows(self):
+        stream = io.BytesIO()
+        assert mazefile.write_rows(stream, 9, Eller.stream(9, 7, rng=3), seed=3) == 7
+
+        maze = Maze.from_bytes(stream.getvalue())
+        assert (maze.columns, maze.rows, maze.seed) == (9, 7, 3)
+        assert maze.walls == b''.join(Eller.stream(9, 7, rng=3))
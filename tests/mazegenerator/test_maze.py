@@ -1,4 +1,9 @@
-from mazegenerator.maze import Maze
+import io
+
+import pytest
+
+from mazegenerator import Direction, mazefile
+from mazegenerator.maze import Maze, MappedMaze, index_typecode
 
 
 class TestMaze:
@@ -23,3 +28,120 @@ class TestMaze:
         print(repr2)
 
         assert repr1 == repr2
+
+    def test_print(self, capsys):
+        maze = Maze.from_str('Maze[4,3,7,1,9,13,5,8,6,8,14,14,7,10]')
+        expected = ('╔═══════════╤═══╗\n'
+                    '║           |   ║\n'
+                    '╟───╴   ╷   ╵   ║\n'
+                    '║       |       ║\n'
+                    '║   ╷   ├───╴   ║\n'
+                    '║   |   |       ║\n'
+                    '╚═══╧═══╧═══════╝\n')
+        assert maze.to_text() == expected
+
+        maze.print()
+        assert capsys.readouterr().out == expected
+
+        stream = io.StringIO()
+        maze.print(fn_w=lambda coord: str(coord[0]), file=stream)
+        assert stream.getvalue().splitlines()[3] == '║ 0   1 | 2   3 ║'
+
+    def test_cell_view(self):
+        maze = Maze(3, 2)
+        maze.crave_passage((0, 0), (1, 0))
+        maze[2, 1].set_visited()
+
+        assert not maze[0, 0].has_wall(Direction.EAST)
+        assert not maze[1, 0].has_wall(Direction.WEST)
+        assert maze[1, 0].has_wall(Direction.EAST)
+        assert maze[2, 1].is_visited()
+        assert not maze[1, 1].is_visited()
+        assert maze.walls[maze.index((1, 0))] == Direction.NORTH | Direction.SOUTH | Direction.EAST
+        assert maze.coord(maze.index((2, 1))) == (2, 1)
+
+    def test_visitable_neighbors(self):
+        maze = Maze(3, 3)
+        maze.crave_passage((1, 1), (1, 0))
+        maze.crave_passage((1, 1), (2, 1))
+        maze[2, 1].set_visited()
+
+        assert maze.visitable_neighbors((1, 1)) == [(1, 0), (2, 1)]
+        assert maze.visitable_neighbors((1, 1), False) == [(1, 0)]
+        assert maze.neighbors((0, 0)) == [(0, 1), (1, 0)]
+
+    def test_to_bytes(self):
+        maze1 = Maze(7, 5)
+        maze1.crave_passage((0, 0), (1, 0))
+        maze1.crave_passage((6, 3), (6, 4))
+        maze1.seed = 42
+        data = maze1.to_bytes()
+
+        assert len(data) == mazefile.HEADER.size + 18
+
+        maze2 = Maze.from_bytes(data)
+        assert repr(maze1) == repr(maze2)
+        assert maze2.seed == 42
+
+    def test_save_load(self, tmp_path):
+        maze1 = Maze(3, 3)
+        maze1.crave_passage((1, 1), (1, 2))
+        maze2 = Maze(4, 2)
+        maze2.crave_passage((0, 0), (0, 1))
+
+        path = tmp_path / 'maze.bin'
+        maze1.save(path)
+        assert repr(Maze.load(path)) == repr(maze1)
+        assert Maze.load(path).seed is None
+
+        with open(path, 'wb') as f:
+            maze1.save(f)
+            maze2.save(f)
+        with open(path, 'rb') as f:
+            assert repr(Maze.load(f)) == repr(maze1)
+            assert repr(Maze.load(f)) == repr(maze2)
+            with pytest.raises(EOFError):
+                Maze.load(f)
+
+    def test_from_bytes_invalid(self):
+        with pytest.raises(ValueError):
+            Maze.from_bytes(b'MAZX' + Maze(2, 2).to_bytes()[4:])
+        with pytest.raises(ValueError):
+            Maze.from_bytes(Maze(2, 2).to_bytes()[:-1])
+
+    def test_new_buffer(self):
+        buffer = Maze(4, 3).new_buffer(value=-1)
+
+        assert len(buffer) == 12 and buffer[0] == -1
+        assert buffer.itemsize == 4
+        assert index_typecode(2 ** 31 - 1) == 'i'
+        assert index_typecode(2 ** 31) == 'q'
+
+    def test_mapped_maze(self, tmp_path):
+        path = tmp_path / 'maze.map'
+        with MappedMaze.create(path, 5, 4) as maze1:
+            assert repr(maze1) == repr(Maze(5, 4))
+            maze1.crave_passage((1, 1), (2, 1))
+            maze1[3, 3].set_visited()
+            assert maze1[3, 3].is_visited()
+            maze1.seed = 7
+            repr1 = repr(maze1)
+
+        maze2 = Maze.load(path)
+        assert repr(maze2) == repr1
+        assert maze2.seed == 7
+
+        with MappedMaze.open(path, writable=False) as maze3:
+            assert repr(maze3) == repr1
+            assert Maze.from_bytes(maze3.to_bytes()).walls == maze2.walls
+            assert maze3.to_text() == maze2.to_text()
+
+    def test_mapped_maze_packed(self, tmp_path):
+        path = tmp_path / 'maze.bin'
+        Maze(3, 3).save(path)
+        with pytest.raises(ValueError):
+            MappedMaze.open(path)
+
+        Maze(3, 3).save(path, unpacked=True)
+        with MappedMaze.open(path) as maze:
+            assert repr(maze) == repr(Maze(3, 3))
@@ -0,0 +1,106 @@
+import io
+import struct
+import zlib
+
+import pytest
+
+from mazegenerator import raster
+from mazegenerator.cli import generate_maze
+from mazegenerator.diameter import maze_diameter
+from mazegenerator.maze import Maze
+
+
+def _png_pixels(data: bytes):
+    """ Rows of pixel indexes of a 2 bit palette PNG written by raster.write_png """
+    assert data[:8] == b'\x89PNG\r\n\x1a\n'
+    pos = 8
+    chunks = {}
+    while pos < len(data):
+        length, chunk_type = struct.unpack('>I4s', data[pos:pos + 8])
+        chunks[chunk_type] = chunks.get(chunk_type, b'') + data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+    width, height, depth, color_type = struct.unpack('>IIBB', chunks[b'IHDR'][:10])
+    assert (depth, color_type) == (2, 3)
+
+    raw = zlib.decompress(chunks[b'IDAT'])
+    row_bytes = 1 + (width + 3) // 4
+    rows = []
+    for y in range(height):
+        line = raw[y * row_bytes + 1:(y + 1) * row_bytes]
+        rows.append(bytes((line[x // 4] >> (6 - 2 * (x % 4))) & 3 for x in range(width)))
+    return rows
+
+
+class TestRaster:
+
+    def test_rows(self):
+        maze = Maze(2, 1)
+        maze.crave_passage((0, 0), (1, 0))
+
+        assert list(raster.raster_rows(maze)) == [b'\x01\x01\x01\x01\x01',
+                                                  b'\x01\x00\x00\x00\x01',
+                                                  b'\x01\x01\x01\x01\x01']
+        assert list(raster.raster_rows(maze, path=[(1, 0), (0, 0)]))[1] == b'\x01\x02\x02\x02\x01'
+        assert list(raster.raster_rows(maze, scale=2))[2] == b'\x01\x01\x00\x00\x00\x00\x00\x00\x01\x01'
+
+    def test_walls(self):
+        maze = generate_maze('kruskal', 9, 7, seed=1)
+        rows = list(raster.raster_rows(maze))
+        assert (len(rows[0]), len(rows)) == raster.image_size(maze)
+
+        for i in range(len(maze)):
+            column, row = maze.coord(i)
+            x = 2 * column + 1
+            y = 2 * row + 1
+            walls = maze.walls[i]
+            assert rows[y][x] == raster.PASSAGE
+            assert (rows[y - 1][x] == raster.WALL) == bool(walls & 0x01)
+            assert (rows[y + 1][x] == raster.WALL) == bool(walls & 0x02)
+            assert (rows[y][x - 1] == raster.WALL) == bool(walls & 0x04)
+            assert (rows[y][x + 1] == raster.WALL) == bool(walls & 0x08)
+
+    def test_png(self):
+        maze = generate_maze('depthfirst', 11, 6, seed=2)
+        path, length = maze_diameter(maze)
+        stream = io.BytesIO()
+        raster.write_png(stream, maze, path, scale=3)
+
+        rows = _png_pixels(stream.getvalue())
+        assert rows == list(raster.raster_rows(maze, path, scale=3))
+        # Cells and passages of the path
+        assert sum(row.count(raster.PATH) for row in rows) == (2 * length + 1) * 9
+
+    def test_pbm(self, tmp_path):
+        maze = generate_maze('eller', 5, 4, seed=3)
+        output = tmp_path / 'maze.pbm'
+        raster.export(maze, output)
+
+        data = output.read_bytes()
+        assert data.startswith(b'P4\n11 9\n')
+        body = data[len(b'P4\n11 9\n'):]
+        assert len(body) == 2 * 9
+        for y, line in enumerate(raster.raster_rows(maze)):
+            bits = int.from_bytes(body[2 * y:2 * y + 2], 'big') >> 5
+            assert [(bits >> (10 - x)) & 1 for x in range(11)] == [pixel == raster.WALL for pixel in line]
+
+    def test_qimage(self):
+        maze = generate_maze('breadthfirst', 6, 5, seed=4)
+        path, _length = maze_diameter(maze)
+        image = raster.to_qimage(maze, path)
+
+        assert (image.width(), image.height()) == raster.image_size(maze)
+        for y, line in enumerate(raster.raster_rows(maze, path)):
+            assert bytes(image.pixelIndex(x, y) for x in range(image.width())) == line
+
+    @pytest.mark.parametrize('scale', [0, -1])
+    def test_invalid_scale(self, tmp_path, scale):
+        maze = generate_maze('eller', 5, 4, seed=3)
+        output = tmp_path / 'maze.png'
+        for write in (raster.write_png, raster.write_pbm):
+            with pytest.raises(ValueError):
+                write(io.BytesIO(), maze, scale=scale)
+        with pytest.raises(ValueError):
+            raster.to_qimage(maze, scale=scale)
+        with pytest.raises(ValueError):
+            raster.export(maze, output, scale=scale)
+        assert not output.exists()
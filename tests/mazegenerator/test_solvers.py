@@ -0,0 +1,55 @@
+import pytest
+
+from mazegenerator.bfslonghestpath import BfsLonghestPath
+from mazegenerator.cli import generate_maze
+from mazegenerator.maze import Maze
+from mazegenerator.solvers.astar import AStar
+from mazegenerator.solvers.bidirectionalbfs import BidirectionalBfs
+from mazegenerator.solvers.deadendfilling import DeadEndFilling
+
+SOLVERS = [AStar, BidirectionalBfs, DeadEndFilling]
+
+
+def assert_path(maze, path, start, goal):
+    assert path[0] == start
+    assert path[-1] == goal
+    for coord1, coord2 in zip(path, path[1:]):
+        assert coord2 in maze.visitable_neighbors(coord1)
+
+
+class TestSolvers:
+
+    @pytest.mark.parametrize('solver', SOLVERS)
+    @pytest.mark.parametrize('algorithm', ['depthfirst', 'kruskal'])
+    def test_solve(self, solver, algorithm):
+        maze = generate_maze(algorithm, 17, 13, seed=2)
+        path = BfsLonghestPath(maze).run()
+        start, goal = path[-1], path[0]
+
+        result = solver(maze).solve(start, goal)
+
+        assert_path(maze, result.path, start, goal)
+        assert len(result.path) == len(path)
+        assert result.expanded > 0
+        assert result.elapsed >= 0
+
+    @pytest.mark.parametrize('solver', SOLVERS)
+    def test_shortest_with_loops(self, solver):
+        maze = Maze(3, 3)
+        for coord1, coord2 in [((0, 0), (1, 0)), ((1, 0), (2, 0)), ((2, 0), (2, 1)), ((2, 1), (2, 2)),
+                               ((0, 0), (0, 1)), ((0, 1), (0, 2)), ((0, 2), (1, 2)), ((1, 2), (2, 2)),
+                               ((0, 1), (1, 1)), ((1, 1), (2, 1))]:
+            maze.crave_passage(coord1, coord2)
+
+        result = solver(maze).solve((0, 0), (2, 2))
+
+        assert_path(maze, result.path, (0, 0), (2, 2))
+        assert len(result.path) == 5
+
+    @pytest.mark.parametrize('solver', SOLVERS)
+    def test_unreachable(self, solver):
+        maze = Maze(3, 1)
+        maze.crave_passage((0, 0), (1, 0))
+
+        assert solver(maze).solve((0, 0), (2, 0)).path == []
+        assert solver(maze).solve((1, 0), (1, 0)).path == [(1, 0)]
@@ -0,0 +1,60 @@
+import pytest
+
+from mazegenerator.cli import generate_maze
+from mazegenerator.maze import Maze
+
+np = pytest.importorskip('numpy')
+wallgrid = pytest.importorskip('mazegenerator.wallgrid')
+
+
+def _python_degrees(maze):
+    return [len(maze.visitable_neighbors(maze.coord(i))) for i in range(len(maze))]
+
+
+class TestWallGrid:
+
+    def test_view(self):
+        maze = Maze(4, 3)
+        grid = wallgrid.wall_grid(maze)
+        assert grid.shape == (3, 4)
+
+        maze.crave_passage((1, 2), (2, 2))
+        assert grid[2, 1] == maze.walls[maze.index((1, 2))]
+
+    def test_carve_edges(self):
+        expected = generate_maze('kruskal', 9, 7, seed=5)
+
+        cells1, cells2 = [], []
+        for i in range(len(expected)):
+            for neighbor in expected.visitable_neighbors(expected.coord(i)):
+                cells1.append(i)
+                cells2.append(expected.index(neighbor))
+
+        maze = Maze(9, 7)
+        wallgrid.carve_edges(maze, np.array(cells1), np.array(cells2))
+        assert maze.walls == expected.walls
+
+    @pytest.mark.parametrize('cells1,cells2', [([0], [2]), ([3], [4]), ([0], [-1]), ([0, 1], [1])])
+    def test_carve_edges_invalid(self, cells1, cells2):
+        with pytest.raises(ValueError):
+            wallgrid.carve_edges(Maze(4, 3), cells1, cells2)
+
+    def test_statistics(self):
+        maze = generate_maze('depthfirst', 15, 11, seed=2)
+        degrees = _python_degrees(maze)
+
+        assert wallgrid.degrees(maze).reshape(-1).tolist() == degrees
+        assert wallgrid.degree_histogram(maze).tolist() == [degrees.count(d) for d in range(5)]
+        assert wallgrid.dead_ends(maze) == degrees.count(1)
+
+    def test_consistency(self):
+        maze = generate_maze('eller', 15, 11, seed=2)
+        assert wallgrid.is_consistent(maze)
+
+        i = maze.index((3, 4))
+        maze.walls[i] ^= 0x08  # toggle the east wall only
+        assert wallgrid.wall_mismatches(maze).tolist() == [i, i + 1]
+
+        maze = Maze(2, 2)
+        maze.walls[0] &= ~0x01  # open the north border
+        assert wallgrid.wall_mismatches(maze).tolist() == [0]
@@ -0,0 +1,64 @@
+import os
+import subprocess
+import sys
+
+from sokoban import Direction
+from sokoban.engine import Game, Step, validate_solution
+from sokoban.levels import get_level
+
+SOLUTION = 'dlUrrrdLullddrUluRuulDrddrruLdlUU'  # Microban 1
+
+
+class TestEngine:
+
+    def test_move_undo_redo(self):
+        level = get_level('Microban', 0)
+        game = Game(level)
+        assert game.player == (2, 3)
+
+        assert game.move(Direction.DOWN) == Step('d', (2, 3), (2, 4), None, None)
+        assert game.move(Direction.LEFT) == Step('l', (2, 4), (1, 4), None, None)
+        assert game.move(Direction.LEFT) is None  # wall
+        assert game.move(Direction.UP) == Step('U', (1, 4), (1, 3), (1, 3), (1, 2))
+        assert game.moves == 'dlU'
+        assert game.pushes == 1
+        assert game.is_box((1, 2))
+
+        assert game.undo() == Step('U', (1, 4), (1, 3), (1, 3), (1, 2))
+        assert game.is_box((1, 3)) and not game.is_box((1, 2))
+        assert game.undo().char == 'l'
+        assert game.redo().char == 'l'
+        assert game.redo() == Step('U', (1, 4), (1, 3), (1, 3), (1, 2))
+        assert game.redo() is None
+
+        game.undo()
+        game.move(Direction.RIGHT)
+        assert game.redo() is None  # a new move clears the redo list
+
+        game.restart()
+        assert game.player == level.player_start
+        assert game.boxes == level.boxes_start
+
+    def test_completion(self):
+        game = Game(get_level('Microban', 0))
+        for char in SOLUTION:
+            assert not game.is_completed()
+            assert game.move({'l': Direction.LEFT, 'u': Direction.UP,
+                              'r': Direction.RIGHT, 'd': Direction.DOWN}[char.lower()]).char == char
+        assert game.is_completed()
+
+    def test_validate_solution(self):
+        txtlevel = get_level('Microban', 0).txtlevel
+        assert validate_solution(txtlevel, SOLUTION)
+        assert not validate_solution(txtlevel, SOLUTION[:-1])
+        assert not validate_solution(txtlevel, SOLUTION.lower())
+        assert not validate_solution(txtlevel, 'x' + SOLUTION)
+
+    def test_no_qt(self):
+        # The engine must be usable where PySide6 is not installed
+        code = ('import sys; sys.modules["PySide6"] = None; '
+                'from sokoban.engine import validate_solution; '
+                'from sokoban.levels import get_level; '
+                f'assert validate_solution(get_level("Microban", 0).txtlevel, "{SOLUTION}")')
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        subprocess.run([sys.executable, '-c', code], check=True, env=env)
@@ -0,0 +1,82 @@
+import pytest
+
+from sokoban import Direction
+from sokoban.gamestate import GameState
+from sokoban.levels import get_level
+
+LEVEL = [
+    "#######",
+    "#     #",
+    "# @$. #",
+    "#     #",
+    "#######",
+]
+
+
+class TestGameState:
+
+    def test_parse(self):
+        state = GameState(LEVEL)
+
+        assert (state.columns, state.rows) == (7, 5)
+        assert state.coord(state.player) == (2, 2)
+        assert [state.coord(i) for i in state.box_indexes()] == [(3, 2)]
+        assert state.is_goal(state.index(4, 2))
+        assert state.is_wall(state.index(0, 0))
+        assert state.is_floor(state.index(5, 3))
+        assert not state.is_completed()
+
+    def test_push_and_undo(self):
+        state = GameState(LEVEL)
+        start = state.key()
+
+        assert state.move(Direction.UP) == 'u'
+        assert state.move(Direction.UP) is None  # wall
+        assert state.move(Direction.DOWN) == 'd'
+        assert state.move(Direction.RIGHT) == 'R'
+        assert state.is_completed()
+        assert state.moves == ['u', 'd', 'R']
+
+        assert state.undo() == 'R'
+        assert not state.is_completed()
+        assert state.undo() == 'd'
+        assert state.undo() == 'u'
+        assert state.undo() is None
+        assert state.key() == start
+
+    def test_blocked_push(self):
+        state = GameState(["#####",
+                           "#@$$#",
+                           "#####"])
+        assert state.move(Direction.RIGHT) is None
+        assert not state.moves
+
+    def test_play(self):
+        state = GameState(LEVEL)
+        assert state.play('R')
+        assert state.is_completed()
+
+        state = GameState(LEVEL)
+        assert not state.play('r')  # it's a push
+        assert not state.moves
+        assert not state.play('uR')  # no box to push
+        assert state.moves == ['u']
+
+        state = GameState(LEVEL)
+        assert not state.play('dlllll')
+        assert state.moves == ['d', 'l']
+
+    def test_no_player(self):
+        with pytest.raises(ValueError):
+            GameState(["####", "#$.#", "####"])
+
+    def test_level(self):
+        level = get_level('Microban', 0)
+
+        assert level.player_start == (2, 3)
+        assert level.boxes_start == [(1, 3), (3, 4)]
+        assert level.goals == [(2, 1), (1, 3)]
+        assert level.is_goal((1, 3)) and not level.is_goal((3, 4))
+        assert level.is_wall(0, 0) and level.is_wall((3, 0))
+        assert level.is_inside(1, 1) and not level.is_inside(5, 0)
+        assert level.new_state().key() == GameState(level.txtlevel).key()
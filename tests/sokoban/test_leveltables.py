@@ -0,0 +1,70 @@
+from sokoban.levels import Level, get_level, get_levels_count, get_sets
+from sokoban.leveltables import ROOM, TUNNEL, UNREACHABLE, LevelTables
+
+LEVEL = [
+    "#########",
+    "#   #   #",
+    "#@$     #",
+    "#   # . #",
+    "#########",
+]
+
+
+class TestLevelTables:
+
+    def test_distances(self):
+        level = Level(9, 5, LEVEL)
+        tables = level.tables
+        state = level.new_state()
+
+        assert list(tables.goal_cells) == [state.index(6, 3)]
+        assert tables.distance(state.index(6, 3), 0) == 0
+        assert tables.distance(state.index(6, 2), 0) == 1
+        assert tables.distance(state.index(2, 2), 0) == 5
+        assert list(tables.goal_distances(state.index(3, 2))) == [4]
+        # Against the top wall a box can't be pushed down any more
+        assert tables.distance(state.index(6, 1), 0) == UNREACHABLE
+
+    def test_dead_squares(self):
+        level = Level(9, 5, LEVEL)
+        state = level.new_state()
+
+        # The wall between the rooms cuts the bottom row from the goal
+        for position in [(1, 1), (2, 1), (7, 1), (1, 3), (3, 3), (5, 3), (7, 3), (1, 2), (7, 2)]:
+            assert level.is_dead(position)
+        for position in [(2, 2), (4, 2), (6, 2), (6, 3)]:
+            assert not level.is_dead(position)
+        assert not level.tables.is_dead(state.index(0, 0))  # a wall is not a square
+
+    def test_tunnels_and_rooms(self):
+        level = Level(9, 5, LEVEL)
+        tables = level.tables
+        state = level.new_state()
+
+        tunnel = state.index(4, 2)
+        assert tables.is_tunnel(tunnel)
+        assert not tables.is_tunnel(state.index(3, 2))
+        assert tables.area_kinds[tables.areas[tunnel]] == TUNNEL
+
+        left = tables.areas[state.index(1, 1)]
+        right = tables.areas[state.index(7, 3)]
+        assert left != right
+        assert tables.area_kinds[left] == ROOM and tables.area_kinds[right] == ROOM
+        assert tables.areas[state.index(3, 3)] == left
+        assert tables.areas[state.index(0, 0)] == 0
+        assert len(tables.area_kinds) == 4  # area 0 is outside the floor
+
+    def test_all_levels(self):
+        for setname in get_sets():
+            for i in range(get_levels_count(setname)):
+                level = get_level(setname, i)
+                tables = level.tables
+                state = level.new_state()
+                assert isinstance(tables, LevelTables)
+                assert len(tables.distances) == tables.cells * len(level.goals)
+                for box in state.box_indexes():
+                    assert not tables.is_dead(box)
+                for goal in tables.goal_cells:
+                    assert not tables.is_dead(goal)
+                    # Some levels have boxes on goals walled in outside the floor
+                    assert tables.areas[goal] > 0 or state.is_box(goal)
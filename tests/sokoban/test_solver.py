@@ -0,0 +1,146 @@
+import json
+
+import pytest
+
+from sokoban.engine import validate_solution
+from sokoban.levels import Level, get_level, _SETS
+from sokoban.solver import Solver, main, read_results
+
+
+def make_level(txtlevel):
+    return Level(max(len(line) for line in txtlevel), len(txtlevel), txtlevel)
+
+
+class TestSolver:
+
+    @pytest.mark.parametrize('method', ['astar', 'idastar'])
+    def test_solve(self, method):
+        level = get_level('Microban', 0)
+        result = Solver(level).solve(method=method)
+
+        assert validate_solution(level.txtlevel, result.solution)
+        assert result.pushes == 8
+        assert result.moves == len(result.solution)
+        assert result.nodes > 0
+        assert not result.timed_out
+
+    def test_push_optimal(self):
+        for i in range(1, 10):
+            level = get_level('Microban', i)
+            astar = Solver(level).solve()
+            idastar = Solver(level).solve(method='idastar')
+            assert validate_solution(level.txtlevel, astar.solution)
+            assert validate_solution(level.txtlevel, idastar.solution)
+            assert astar.pushes == idastar.pushes
+
+    def test_solve_from_state(self):
+        level = get_level('Microban', 0)
+        state = level.new_state()
+        assert state.play('dlU')
+        result = Solver(level).solve(state)
+
+        assert validate_solution(level.txtlevel, 'dlU' + result.solution)
+
+    def test_dead_squares(self):
+        level = make_level([
+            "######",
+            "#@ $ #",
+            "#.   #",
+            "######",
+        ])
+        solver = Solver(level)
+        state = level.new_state()
+
+        # Along the top wall a box can only move sideways
+        assert solver.dead >> state.index(3, 1) & 1
+        assert solver.dead >> state.index(1, 1) & 1
+        assert not solver.dead >> state.index(3, 2) & 1
+        assert not solver.dead >> state.index(1, 2) & 1
+        result = solver.solve()
+        assert result.solution is None
+        assert not result.timed_out
+
+    def test_freeze_deadlock(self):
+        level = make_level([
+            "#######",
+            "#.   .#",
+            "# $$  #",
+            "# $$  #",
+            "#@  ..#",
+            "#######",
+        ])
+        solver = Solver(level)
+        state = level.new_state()
+
+        assert solver.is_freeze_deadlock(state.index(2, 2), state.boxes)
+        assert not solver.is_freeze_deadlock(state.index(2, 2), state.boxes ^ 1 << state.index(3, 3))
+        assert solver.solve().solution is None
+
+    def test_lower_bound(self):
+        level = get_level('Microban', 0)
+        solver = Solver(level)
+        state = level.new_state()
+
+        assert 0 < solver.lower_bound(state.boxes) <= 8
+        assert solver.lower_bound(state.goals) == 0
+
+    def test_timeout(self):
+        level = get_level('Microban', 143)
+        result = Solver(level).solve(timeout=0.2)
+
+        assert result.solution is None
+        assert result.timed_out
+        assert result.nodes_per_second > 0
+
+    def test_unknown_method(self):
+        with pytest.raises(ValueError):
+            Solver(get_level('Microban', 0)).solve(method='bfs')
+
+
+class TestBatch:
+
+    def test_resume(self, tmp_path):
+        output = tmp_path / 'microban.jsonl'
+        names = list(_SETS['Microban'])
+        # A previous run that solved all but the first two levels, the second one timed out,
+        # and was interrupted while writing a line
+        with open(output, 'w', encoding='utf-8') as f:
+            for name in names[2:]:
+                result = {'set': 'Microban', 'level': name, 'solution': '', 'timed_out': False}
+                f.write(json.dumps(result) + '\n')
+            result = {'set': 'Microban', 'level': names[1], 'solution': None, 'timed_out': True}
+            f.write(json.dumps(result) + '\n')
+            f.write('{"set": "Micro')
+
+        main(['--set', 'Microban', '--jobs', '1', '--timeout', '5', '--output', str(output)])
+
+        results = read_results(output)
+        assert len(results) == len(names)
+        for index in (0, 1):
+            result = results[names[index]]
+            assert result['index'] == index
+            assert validate_solution(get_level('Microban', index).txtlevel, result['solution'])
+            assert result['pushes'] > 0 and result['nodes'] > 0
+            assert not result['timed_out']
+
+    def test_resume_without_timed_out(self, tmp_path):
+        output = tmp_path / 'microban.jsonl'
+        names = list(_SETS['Microban'])
+        # Lines written by hand or by an older version, without the timed_out field
+        with open(output, 'w', encoding='utf-8') as f:
+            for name in names[1:]:
+                f.write(json.dumps({'level': name, 'solution': ''}) + '\n')
+
+        main(['--set', 'Microban', '--jobs', '1', '--output', str(output)])
+
+        results = read_results(output)
+        assert len(results) == len(names)
+        assert results[names[0]]['pushes'] == 8
+        assert results[names[1]] == {'level': names[1], 'solution': ''}
+
+    @pytest.mark.parametrize('option', [['--jobs', '0'], ['--jobs', '-1'], ['--timeout', '0']])
+    def test_invalid_options(self, tmp_path, option):
+        output = tmp_path / 'microban.jsonl'
+        with pytest.raises(SystemExit):
+            main(['--set', 'Microban', *option, '--output', str(output)])
+        assert not output.exists()